@@ -1,14 +1,17 @@
 """Game application handlers"""
 
-from .start_game_handler import StartGameHandler
+from .start_game_handler import StartGameHandler, PortfolioNotFoundError
 from .start_round_handler import StartRoundHandler
 from .submit_decision_handler import SubmitDecisionHandler
 from .generate_final_report_handler import GenerateFinalReportHandler
+from .round_context import RoundContext
 
 __all__ = [
     "StartGameHandler",
+    "PortfolioNotFoundError",
     "StartRoundHandler",
     "SubmitDecisionHandler",
-    "GenerateFinalReportHandler"
+    "GenerateFinalReportHandler",
+    "RoundContext"
 ]
 
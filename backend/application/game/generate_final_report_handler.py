@@ -1,12 +1,86 @@
 """Generate Final Report Use Case Handler"""
 
-from typing import Dict, List
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Tuple
+import numpy as np
+import orjson
+import pandas as pd
 from infrastructure.agents.tools.insight_tools import (
     aggregate_behavior,
     classify_profile,
     generate_coaching
 )
-import json
+from infrastructure.clients import run_query
+
+logger = logging.getLogger(__name__)
+
+# Flags derived per round, in the order they are reported
+BEHAVIOR_FLAGS = (
+    "panic_sell",
+    "ignored_data",
+    "followed_villain_high_contradiction",
+    "resisted_villain"
+)
+
+# Max entries kept in the insight result cache (LRU eviction)
+INSIGHT_CACHE_SIZE = 256
+
+
+def _cache_key(*parts: Any) -> str:
+    """Helper: Stable hash of JSON-serializable inputs"""
+    payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _empty_report(game_id: str) -> Dict:
+    """Helper: Report returned when a game has no decision data"""
+    return {
+        "game_id": game_id,
+        "profile": "No Data",
+        "coaching": ["No decision data available for analysis"],
+        "summary": {
+            "total_rounds": 0,
+            "final_portfolio_value": 0,
+            "total_pl": 0,
+            "total_return_pct": 0,
+            "data_tab_usage": 0,
+            "consensus_alignment": 0
+        },
+        "metrics": {}
+    }
+
+
+def _build_summary(
+    decision_logs: List[Dict],
+    metrics: Dict,
+    final_portfolio_value: float,
+    initial_portfolio_value: float
+) -> Dict:
+    """Helper: Summary stats shown at the top of the final report"""
+    # Calculate total P/L as the difference between final and initial values
+    total_pl = final_portfolio_value - initial_portfolio_value
+    
+    # Calculate return percentage based on actual initial investment
+    total_return = (total_pl / initial_portfolio_value) * 100 if initial_portfolio_value > 0 else 0
+    
+    return {
+        "total_rounds": len(decision_logs),
+        "final_portfolio_value": int(round(final_portfolio_value)),
+        "total_pl": int(round(total_pl)),
+        "total_return_pct": round(total_return, 2),
+        "data_tab_usage": metrics.get("data_tab_usage", 0),
+        "consensus_alignment": metrics.get("consensus_alignment", 0)
+    }
+
+
+def _column(df: pd.DataFrame, name: str, default: Any) -> pd.Series:
+    """Helper: Get a column with missing values (or a missing column) filled by default"""
+    if name not in df:
+        return pd.Series(default, index=df.index)
+    return df[name].fillna(default)
 
 
 class GenerateFinalReportHandler:
@@ -19,11 +93,15 @@ class GenerateFinalReportHandler:
     3. Generate personalized coaching
     """
     
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, round_writer=None):
         # In production, inject repository dependencies
         self.game_repo = None  # TODO: inject SupabaseGameRepository
         self.decision_tracker_repo = None  # TODO: inject SupabaseDecisionTrackerRepository
         self.supabase = supabase_client
+        # Write-behind buffer for game_rounds; flushed before reading decision logs
+        self.round_writer = round_writer
+        # Insight results are pure functions of the decision logs; reuse them across reports
+        self._insights_cache: "OrderedDict[str, Dict]" = OrderedDict()
     
     async def execute(self, game_id: str) -> Dict:
         """
@@ -35,206 +113,243 @@ class GenerateFinalReportHandler:
         Returns:
             Dict with profile, coaching, and summary stats
         """
-        # Fetch all decision logs for this game from database
-        decision_logs = await self._fetch_decision_logs(game_id)
+        # Fetch decision logs and portfolio values concurrently (independent queries)
+        decision_logs, (final_portfolio_value, initial_portfolio_value) = await asyncio.gather(
+            self._fetch_decision_logs(game_id),
+            self._get_portfolio_values(game_id)
+        )
         
         if not decision_logs:
             # If no real data, return empty report
-            return {
-                "game_id": game_id,
-                "profile": "No Data",
-                "coaching": ["No decision data available for analysis"],
-                "summary": {
-                    "total_rounds": 0,
-                    "final_portfolio_value": 0,
-                    "total_pl": 0,
-                    "total_return_pct": 0,
-                    "data_tab_usage": 0,
-                    "consensus_alignment": 0
-                },
-                "metrics": {}
-            }
-        
-        # Aggregate behavior
-        metrics_result = await aggregate_behavior.ainvoke({"decision_logs": json.dumps(decision_logs)})
-        metrics = json.loads(metrics_result)
-        
-        # Classify profile
-        profile_result = await classify_profile.ainvoke({"metrics": json.dumps(metrics)})
-        profile_data = json.loads(profile_result)
-        profile = profile_data["profile"]
-        
-        # Generate coaching
-        coaching_result = await generate_coaching.ainvoke({
-            "decision_logs": json.dumps(decision_logs),
-            "profile": profile
-        })
-        coaching_data = json.loads(coaching_result)
-        coaching_tips = coaching_data["coaching"]
+            return _empty_report(game_id)
         
-        # Get the final portfolio value from the most recent portfolio update
-        final_portfolio_value = await self._get_final_portfolio_value(game_id)
-        
-        # Get the actual initial portfolio value (not hardcoded)
-        initial_portfolio_value = await self._get_initial_portfolio_value(game_id)
-        
-        # Calculate total P/L as the difference between final and initial values
-        total_pl = final_portfolio_value - initial_portfolio_value
-        
-        # Calculate return percentage based on actual initial investment
-        total_return = (total_pl / initial_portfolio_value) * 100 if initial_portfolio_value > 0 else 0
+        # Metrics, profile and coaching (single LLM request)
+        insights = {}
+        async for step in self._insight_steps(decision_logs):
+            insights.update(step)
+        metrics = insights["metrics"]
         
         return {
             "game_id": game_id,
-            "profile": profile,
-            "coaching": coaching_tips,
-            "summary": {
-                "total_rounds": len(decision_logs),
-                "final_portfolio_value": int(round(final_portfolio_value)),
-                "total_pl": int(round(total_pl)),
-                "total_return_pct": round(total_return, 2),
-                "data_tab_usage": metrics.get("data_tab_usage", 0),
-                "consensus_alignment": metrics.get("consensus_alignment", 0)
-            },
+            "profile": insights["profile"],
+            "coaching": insights["coaching"],
+            "summary": _build_summary(decision_logs, metrics, final_portfolio_value, initial_portfolio_value),
             "metrics": metrics
         }
     
-    async def _fetch_decision_logs(self, game_id: str) -> List[Dict]:
+    async def stream(self, game_id: str) -> AsyncIterator[Dict]:
         """
-        Fetch decision logs from game_rounds table for the given game.
+        Generate final report progressively.
+        
+        Yields report fields as soon as they are available so the client can
+        render the summary before the coaching LLM call finishes:
+        1. game_id, summary and metrics (database + local aggregation)
+        2. profile (rule-based)
+        3. coaching (LLM)
         
         Args:
             game_id: Game session ID
             
-        Returns:
-            List of decision log dictionaries
+        Yields:
+            Partial report dicts; merged together they equal execute()'s result
         """
-        if not self.supabase:
-            print("Warning: Supabase client not configured, cannot fetch decision logs")
-            return []
+        decision_logs, (final_portfolio_value, initial_portfolio_value) = await asyncio.gather(
+            self._fetch_decision_logs(game_id),
+            self._get_portfolio_values(game_id)
+        )
         
-        try:
-            # Fetch all rounds for this game session
-            response = self.supabase.table("game_rounds").select("*").eq("session_id", game_id).order("round_number").execute()
-            
-            if not response.data:
-                print(f"No decision logs found for game {game_id}")
-                return []
-            
-            # Convert database records to decision log format expected by insight tools
-            decision_logs = []
-            for record in response.data:
-                # Determine consensus from event data (simplified logic)
-                consensus = "Neutral"
-                if record.get("villain_stance") == "Bullish":
-                    consensus = "Bullish" if record.get("contradiction_score", 0.5) < 0.7 else "Bearish"
-                elif record.get("villain_stance") == "Bearish":
-                    consensus = "Bearish" if record.get("contradiction_score", 0.5) < 0.7 else "Bullish"
-                
-                # Determine behavior flags based on decision patterns
-                behavior_flags = []
-                if record.get("player_decision") == "SELL_ALL" and record.get("opened_data_tab", False) == False:
-                    behavior_flags.append("panic_sell")
-                if not record.get("opened_data_tab", False):
-                    behavior_flags.append("ignored_data")
-                if record.get("contradiction_score", 0) > 0.7:
-                    if record.get("villain_stance") == "Bullish" and record.get("player_decision") in ["HOLD", "BUY"]:
-                        behavior_flags.append("followed_villain_high_contradiction")
-                    elif record.get("villain_stance") == "Bearish" and record.get("player_decision") in ["SELL_ALL", "SELL_HALF"]:
-                        behavior_flags.append("followed_villain_high_contradiction")
-                    else:
-                        behavior_flags.append("resisted_villain")
-                
-                decision_log = {
-                    "round_number": record.get("round_number", 0),
-                    "player_decision": record.get("player_decision", ""),
-                    "opened_data_tab": record.get("opened_data_tab", False),
-                    "pl_dollars": float(record.get("pl_dollars", 0)),
-                    "consensus": consensus,
-                    "contradiction_score": float(record.get("villain_contradiction_score", 0.5)),  # Use a field if it exists
-                    "behavior_flags": behavior_flags
+        if not decision_logs:
+            yield _empty_report(game_id)
+            return
+        
+        async for step in self._insight_steps(decision_logs):
+            if "metrics" in step:
+                metrics = step["metrics"]
+                yield {
+                    "game_id": game_id,
+                    "summary": _build_summary(decision_logs, metrics, final_portfolio_value, initial_portfolio_value),
+                    "metrics": metrics
                 }
-                
-                decision_logs.append(decision_log)
-            
-            print(f"Fetched {len(decision_logs)} decision logs for game {game_id}")
-            return decision_logs
+            else:
+                yield step
+    
+    async def _insight_steps(self, decision_logs: List[Dict]) -> AsyncIterator[Dict]:
+        """
+        Generate metrics, profile and coaching for the decision logs, step by step.
+        
+        Shared by execute() and stream() so both return the same report.
+        Metrics and profile are rule-based; coaching is the only LLM request.
+        Results are reused for identical logs; only complete reports with LLM
+        coaching are cached, so fallback coaching is retried by a later report.
+        
+        Args:
+            decision_logs: Decision logs for the game
             
-        except Exception as e:
-            print(f"Error fetching decision logs for game {game_id}: {e}")
-            return []
+        Yields:
+            {"metrics": ...}, then {"profile": ...}, then {"coaching": ...}
+        """
+        key = _cache_key(decision_logs)
+        cached = self._cache_get(self._insights_cache, key)
+        if cached is not None:
+            yield {"metrics": cached["metrics"]}
+            yield {"profile": cached["profile"]}
+            yield {"coaching": cached["coaching"]}
+            return
+        
+        # Step 1: Aggregate behavior
+        metrics = await aggregate_behavior.ainvoke({"decision_logs": decision_logs})
+        yield {"metrics": metrics}
+        
+        # Step 2: Classify profile (needs metrics)
+        profile_data = await classify_profile.ainvoke({"metrics": metrics})
+        profile = profile_data["profile"]
+        yield {"profile": profile}
+        
+        # Step 3: Generate coaching (needs profile)
+        coaching_data = await generate_coaching.ainvoke({
+            "decision_logs": decision_logs,
+            "profile": profile
+        })
+        if coaching_data.get("success"):
+            self._cache_put(self._insights_cache, key, {
+                "metrics": metrics,
+                "profile": profile,
+                "coaching": coaching_data["coaching"]
+            })
+        else:
+            logger.warning("Using fallback coaching for report: %s", coaching_data.get("error"))
+        yield {"coaching": coaching_data["coaching"]}
+    
+    @staticmethod
+    def _cache_get(cache: OrderedDict, key: str) -> Dict | None:
+        """Helper: LRU lookup"""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key: str, value: Dict) -> None:
+        """Helper: LRU insert with eviction"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > INSIGHT_CACHE_SIZE:
+            cache.popitem(last=False)
     
-    async def _get_final_portfolio_value(self, game_id: str) -> float:
+    async def _fetch_decision_logs(self, game_id: str) -> List[Dict]:
         """
-        Get the final portfolio value for the game.
+        Fetch decision logs from game_rounds table for the given game.
         
         Args:
             game_id: Game session ID
             
         Returns:
-            Final portfolio value
+            List of decision log dictionaries
         """
         if not self.supabase:
-            return 1_000_000  # Default fallback
+            logger.warning("Supabase client not configured, cannot fetch decision logs")
+            return []
+        
+        # Make sure queued round outcomes have landed before reading them back
+        if self.round_writer:
+            await self.round_writer.flush()
         
         try:
-            # Get the portfolio_id from the game session
-            session_response = self.supabase.table("game_sessions").select("portfolio_id").eq("id", game_id).execute()
+            # Fetch all rounds for this game session
+            response = await run_query(self.supabase.table("game_rounds").select("*").eq("session_id", game_id).order("round_number"))
+            
+            if not response.data:
+                logger.info("No decision logs found for game %s", game_id)
+                return []
             
-            if not session_response.data:
-                return 1_000_000  # Default fallback
+            # Convert database records to decision log format expected by insight tools
+            # (evaluated column-wise instead of branching per record)
+            df = pd.DataFrame(response.data)
+            stance = _column(df, "villain_stance", "")
+            decision = _column(df, "player_decision", "")
+            opened = _column(df, "opened_data_tab", False).astype(bool)
+            bullish = stance == "Bullish"
+            bearish = stance == "Bearish"
             
-            portfolio_id = session_response.data[0]["portfolio_id"]
+            # Determine consensus from event data (simplified logic)
+            agrees = _column(df, "contradiction_score", 0.5).astype(float) < 0.7
+            consensus = np.select(
+                [bullish & agrees, bullish, bearish & agrees, bearish],
+                ["Bullish", "Bearish", "Bearish", "Bullish"],
+                default="Neutral"
+            )
             
-            # Get the current portfolio value
-            portfolio_response = self.supabase.table("portfolios").select("total_value").eq("id", portfolio_id).execute()
+            # Determine behavior flags based on decision patterns
+            high_contradiction = _column(df, "contradiction_score", 0).astype(float) > 0.7
+            followed = high_contradiction & (
+                (bullish & decision.isin(["HOLD", "BUY"]))
+                | (bearish & decision.isin(["SELL_ALL", "SELL_HALF"]))
+            )
+            flag_masks = zip(
+                (decision == "SELL_ALL") & ~opened,
+                ~opened,
+                followed,
+                high_contradiction & ~followed
+            )
+            behavior_flags = [
+                [flag for flag, on in zip(BEHAVIOR_FLAGS, row) if on]
+                for row in flag_masks
+            ]
             
-            if not portfolio_response.data:
-                return 1_000_000  # Default fallback
+            decision_logs = pd.DataFrame({
+                "round_number": _column(df, "round_number", 0).astype(int),
+                "player_decision": decision,
+                "opened_data_tab": opened,
+                "pl_dollars": _column(df, "pl_dollars", 0).astype(float),
+                "consensus": consensus,
+                "contradiction_score": _column(df, "villain_contradiction_score", 0.5).astype(float),  # Use a field if it exists
+                "behavior_flags": behavior_flags
+            }).to_dict(orient="records")
             
-            return float(portfolio_response.data[0]["total_value"])
+            logger.debug("Fetched %d decision logs for game %s", len(decision_logs), game_id)
+            return decision_logs
             
-        except Exception as e:
-            print(f"Error fetching final portfolio value for game {game_id}: {e}")
-            return 1_000_000  # Default fallback
+        except Exception:
+            logger.exception("Error fetching decision logs for game %s", game_id)
+            return []
     
-    async def _get_initial_portfolio_value(self, game_id: str) -> float:
+    async def _get_portfolio_values(self, game_id: str) -> Tuple[float, float]:
         """
-        Get the initial portfolio value for the game.
+        Get the final and initial portfolio values for the game.
+        
+        Uses the get_game_portfolio_snapshot RPC so the session, portfolio
+        and positions lookups happen in a single round-trip.
         
         Args:
             game_id: Game session ID
             
         Returns:
-            Initial portfolio value
+            (final_portfolio_value, initial_portfolio_value)
         """
+        default = (1_000_000, 1_000_000)  # Default fallback
+        
         if not self.supabase:
-            return 1_000_000  # Default fallback
+            return default
         
         try:
-            # Get the portfolio_id from the game session
-            session_response = self.supabase.table("game_sessions").select("portfolio_id").eq("id", game_id).execute()
+            response = await run_query(self.supabase.rpc("get_game_portfolio_snapshot", {"session_id": game_id}))
             
-            if not session_response.data:
-                return 1_000_000  # Default fallback
-            
-            portfolio_id = session_response.data[0]["portfolio_id"]
-            
-            # Calculate initial value as cash + sum of initial allocations (no initial_cash column in schema)
-            portfolio_response = self.supabase.table("portfolios").select("cash").eq("id", portfolio_id).execute()
-            positions_response = self.supabase.table("positions").select("allocation").eq("portfolio_id", portfolio_id).execute()
+            if not response.data:
+                return default
             
-            if not portfolio_response.data:
-                return 1_000_000  # Default fallback
+            snapshot = response.data[0]
+            final_value = float(snapshot["total_value"])
             
-            current_cash = float(portfolio_response.data[0].get("cash", 0) or 0)
-            total_allocations = sum(float(pos["allocation"]) for pos in (positions_response.data or []))
+            # Initial value is recorded on the session at game start; sessions
+            # created before that fall back to cash + sum of initial allocations
+            initial_value = snapshot.get("initial_portfolio_value")
+            if initial_value is None:
+                initial_value = float(snapshot.get("cash", 0) or 0) + float(snapshot.get("sum_allocations", 0) or 0)
+            initial_value = float(initial_value)
             
-            # If both are zero (unlikely), fall back to 1,000,000
-            initial_value = current_cash + total_allocations
-            return initial_value if initial_value > 0 else 1_000_000
+            # If it is zero (unlikely), fall back to 1,000,000
+            return final_value, (initial_value if initial_value > 0 else 1_000_000)
             
-        except Exception as e:
-            print(f"Error fetching initial portfolio value for game {game_id}: {e}")
-            return 1_000_000  # Default fallback
-
+        except Exception:
+            logger.exception("Error fetching portfolio snapshot for game %s", game_id)
+            return default
@@ -0,0 +1,88 @@
+"""Per-round state shared between round start and decision submission"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+from infrastructure.yfinance_adapter.historical_sampler import sample_historical_window
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on pending samples kept for abandoned rounds
+MAX_PREFETCHED_WINDOWS = 256
+
+
+class RoundContext:
+    """
+    Holds work started at round start that the decision step will need.
+
+    The historical window for a round depends only on the event (ticker,
+    type, horizon), which is known as soon as the round starts. Sampling it
+    then lets it run while the player reads the event, so submitting a
+    decision doesn't wait on yfinance.
+    """
+
+    def __init__(self):
+        # (game_id, round_number) -> (ticker, sampling task)
+        self._windows: Dict[Tuple[str, int], Tuple[str, asyncio.Task]] = {}
+
+    def prefetch_window(
+        self,
+        game_id: str,
+        round_number: int,
+        ticker: str,
+        event_type: str,
+        horizon: int
+    ) -> None:
+        """
+        Start sampling the historical window for a round in the background.
+
+        Args:
+            game_id: Game session ID
+            round_number: Round number
+            ticker: Event ticker
+            event_type: Event type
+            horizon: Event horizon in trading days
+        """
+        key = (game_id, round_number)
+        previous = self._windows.pop(key, None)
+        if previous:
+            previous[1].cancel()
+
+        task = asyncio.create_task(
+            sample_historical_window(ticker=ticker, event_type=event_type, horizon=horizon)
+        )
+        # Retrieve failures so unused samples don't log "exception never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._windows[key] = (ticker, task)
+
+        # Evict the oldest samples (abandoned rounds)
+        while len(self._windows) > MAX_PREFETCHED_WINDOWS:
+            oldest = next(iter(self._windows))
+            self._windows.pop(oldest)[1].cancel()
+
+    async def take_window(self, game_id: str, round_number: int, ticker: str) -> Optional[Dict]:
+        """
+        Get the prefetched historical window for a round.
+
+        Args:
+            game_id: Game session ID
+            round_number: Round number
+            ticker: Ticker the decision is for
+
+        Returns:
+            Historical case, or None if none was prefetched for this ticker or sampling failed
+        """
+        entry = self._windows.pop((game_id, round_number), None)
+        if entry is None:
+            return None
+
+        prefetched_ticker, task = entry
+        if prefetched_ticker != ticker:
+            task.cancel()
+            return None
+
+        try:
+            return await task
+        except Exception as e:
+            logger.warning("Prefetched historical window for round %s failed: %s", round_number, e)
+            return None
@@ -1,7 +1,15 @@
 """Start Game Use Case Handler"""
 
-import uuid
+import logging
 from typing import Dict, Optional
+from infrastructure.ids import uuid7
+from infrastructure.clients import run_query
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioNotFoundError(LookupError):
+    """Raised when a game is started for a portfolio that does not exist"""
 
 
 class StartGameHandler:
@@ -30,43 +38,40 @@ class StartGameHandler:
             
         Returns:
             Dict with game_id and initial state
+            
+        Raises:
+            PortfolioNotFoundError: Portfolio does not exist in Supabase
         """
-        # Fetch portfolio value from Supabase if available
         # Always start with $1,000,000 base value
         portfolio_value = 1_000_000.0
         
-        if self.supabase:
-            try:
-                # Verify portfolio exists and get its current value
-                portfolio_response = self.supabase.table("portfolios").select("total_value").eq("id", portfolio_id).execute()
-                
-                if portfolio_response.data and len(portfolio_response.data) > 0:
-                    # Use the portfolio's total value (should be $1M for new portfolios)
-                    portfolio_value = float(portfolio_response.data[0]["total_value"])
-            except Exception as e:
-                print(f"Warning: Failed to fetch portfolio from Supabase: {e}")
-                # Continue with default $1M value
-        
-        # Create game session
-        game_id = str(uuid.uuid4())
+        # Create game session (time-ordered id keeps game_sessions inserts index-local)
+        game_id = str(uuid7())
         
-        # Save game session to Supabase if available
+        # Verify portfolio and save game session to Supabase in one round-trip
         if self.supabase:
             try:
-                self.supabase.table("game_sessions").insert({
-                    "id": game_id,
-                    "portfolio_id": portfolio_id,
-                    "current_round": 0,
-                    "portfolio_value": portfolio_value
-                }).execute()
+                session_response = await run_query(self.supabase.rpc("start_game", {
+                    "session_id": game_id,
+                    "portfolio_id": portfolio_id
+                }))
             except Exception as e:
-                print(f"Warning: Failed to save game session to Supabase: {e}")
+                logger.warning("Failed to save game session to Supabase: %s", e)
                 # Continue anyway - will use in-memory storage
+                session_response = None
+            
+            if session_response is not None:
+                # No row inserted: the portfolio does not exist
+                if not session_response.data:
+                    raise PortfolioNotFoundError(f"Portfolio {portfolio_id} not found")
+                
+                # Use the portfolio's total value (should be $1M for new portfolios)
+                portfolio_value = float(session_response.data[0]["portfolio_value"])
         
-        # Log to Opik
+        # Log to Opik (fire-and-forget, off the request path)
         try:
-            from infrastructure.observability.opik_tracer import log_game_event
-            log_game_event("game_started", {
+            from infrastructure.observability.opik_tracer import log_game_event_background
+            log_game_event_background("game_started", {
                 "game_id": game_id,
                 "portfolio_id": portfolio_id,
                 "portfolio_value": portfolio_value,
@@ -74,7 +79,7 @@ class StartGameHandler:
             })
         except Exception as e:
             # Don't fail if Opik logging fails
-            print(f"Warning: Failed to log to Opik: {e}")
+            logger.warning("Failed to log to Opik: %s", e)
         
         return {
             "game_id": game_id,
@@ -1,14 +1,29 @@
 """Start Round Use Case Handler"""
 
-from typing import Dict, Optional
+import asyncio
+import logging
+import re
+from typing import Dict, Optional, Tuple
 from infrastructure.agents.game_graph import start_round
+from application.game.round_context import RoundContext
+
+logger = logging.getLogger(__name__)
+
+# Rounds per game (game_rounds.round_number CHECK constraint)
+MAX_ROUNDS = 3
+
+# Exchange ticker symbols (e.g. AAPL, BRK.B, BRK-B)
+TICKER_PATTERN = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
+
+# Upper bound on speculative rounds kept for abandoned games
+MAX_PREFETCHED_ROUNDS = 256
 
 
 class StartRoundHandler:
     """
     Handler for starting a new game round.
     
-    Invokes multi-agent graph to:
+    Runs the multi-agent round pipeline to:
     1. Generate event (Event Generator Agent)
     2. Fetch news (News Agent)
     3. Get price data (Price Agent)
@@ -16,7 +31,17 @@ class StartRoundHandler:
     5. Provide neutral tip (Insight Agent)
     """
     
-    def __init__(self):
+    def __init__(self, round_context: RoundContext = None):
+        """
+        Initialize handler with optional shared round context.
+        
+        Args:
+            round_context: Shared round state; the round's historical window is prefetched into it
+        """
+        self.round_context = round_context
+        # Speculatively generated next rounds and the allocations they were
+        # generated from, keyed by (game_id, round_number)
+        self._prefetched: Dict[Tuple[str, int], Tuple[asyncio.Task, Dict[str, float]]] = {}
         # In production, inject repository dependencies
         self.game_repo = None  # TODO: inject SupabaseGameRepository
         self.portfolio_repo = None  # TODO: inject SupabasePortfolioRepository
@@ -41,32 +66,47 @@ class StartRoundHandler:
             Dict with event, villain take, and data tab
             
         Raises:
-            ValueError: If portfolio or portfolio_value not provided
+            ValueError: If portfolio or portfolio_value is missing or malformed
         """
         # IMPORTANT: Portfolio MUST be provided - no hardcoded fallback
         # This ensures events are always generated for the user's actual tickers
-        if not portfolio or portfolio_value is None:
+        # (validated up front so malformed input never reaches the agents)
+        if not portfolio:
             raise ValueError(
                 "Portfolio data is required. Cannot start round without user's portfolio. "
                 "This is a critical error - portfolio should be passed from game session."
             )
         
-        # Validate portfolio is not empty
-        if not portfolio or len(portfolio) == 0:
-            raise ValueError("Portfolio cannot be empty. User must have at least one position.")
+        if portfolio_value is None or portfolio_value <= 0:
+            raise ValueError(f"Portfolio value must be positive, got {portfolio_value}")
+        
+        for ticker, allocation in portfolio.items():
+            if not isinstance(ticker, str) or not TICKER_PATTERN.match(ticker):
+                raise ValueError(f"Invalid ticker in portfolio: {ticker!r}")
+            if isinstance(allocation, bool) or not isinstance(allocation, (int, float)) or allocation < 0:
+                raise ValueError(f"Invalid allocation for {ticker}: {allocation!r}")
         
         # Use DYNAMIC portfolio data (user's actual tickers and allocations)
         portfolio_data = portfolio
         
-        # Invoke multi-agent graph with DYNAMIC portfolio
-        # Event Generator will select a ticker from this portfolio
-        result = await start_round(
-            game_id=game_id,
-            portfolio_id="mock_portfolio_id",  # TODO: pass actual portfolio_id
-            round_number=round_number,
-            portfolio=portfolio_data,  # DYNAMIC: User's actual tickers
-            portfolio_value=portfolio_value
-        )
+        # Use the round prefetched while the player was on the previous one, if still valid
+        result = await self._take_prefetched(game_id, round_number, portfolio_data)
+        
+        if result is None:
+            # Run the round agents with DYNAMIC portfolio
+            # Event Generator will select a ticker from this portfolio
+            result = await self._start_round(game_id, round_number, portfolio_data, portfolio_value)
+        
+        # Sample the outcome window now so the decision doesn't wait on it
+        if self.round_context:
+            event = result["event"]
+            self.round_context.prefetch_window(
+                game_id, round_number, event["ticker"], event["type"], event["horizon"]
+            )
+        
+        # Build the next round in the background while the player reads this one
+        if round_number < MAX_ROUNDS:
+            self._prefetch(game_id, round_number + 1, portfolio_data, portfolio_value)
         
         # Save round data (TODO: implement persistence)
         # await self.game_repo.save_round(game_id, round_number, result)
@@ -79,3 +119,89 @@ class StartRoundHandler:
             "data_tab": result["data_tab"]
         }
 
+    
+    async def _start_round(
+        self,
+        game_id: str,
+        round_number: int,
+        portfolio: Dict[str, float],
+        portfolio_value: float
+    ) -> Dict:
+        """Run the multi-agent round pipeline for one round"""
+        return await start_round(
+            game_id=game_id,
+            portfolio_id="mock_portfolio_id",  # TODO: pass actual portfolio_id
+            round_number=round_number,
+            portfolio=portfolio,  # DYNAMIC: User's actual tickers
+            portfolio_value=portfolio_value
+        )
+    
+    def _prefetch(
+        self,
+        game_id: str,
+        round_number: int,
+        portfolio: Dict[str, float],
+        portfolio_value: float
+    ) -> None:
+        """
+        Start generating a round in the background.
+        
+        Args:
+            game_id: Game session ID
+            round_number: Round to generate
+            portfolio: Portfolio snapshot at prefetch time
+            portfolio_value: Portfolio value at prefetch time
+        """
+        key = (game_id, round_number)
+        previous = self._prefetched.pop(key, None)
+        if previous:
+            previous[0].cancel()
+        
+        snapshot = dict(portfolio)
+        task = asyncio.create_task(
+            self._start_round(game_id, round_number, snapshot, portfolio_value)
+        )
+        # Retrieve failures so unused prefetches don't log "exception never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._prefetched[key] = (task, snapshot)
+        
+        # Evict the oldest prefetches (abandoned games)
+        while len(self._prefetched) > MAX_PREFETCHED_ROUNDS:
+            oldest = next(iter(self._prefetched))
+            self._prefetched.pop(oldest)[0].cancel()
+    
+    async def _take_prefetched(
+        self,
+        game_id: str,
+        round_number: int,
+        portfolio: Dict[str, float]
+    ) -> Optional[Dict]:
+        """
+        Get a prefetched round if one exists and is still valid.
+        
+        A prefetched round is discarded if it failed or if the allocations
+        it was generated from no longer match the portfolio (e.g. after a
+        BUY, SELL_HALF or SELL_ALL), since its ticker was drawn from them.
+        
+        Args:
+            game_id: Game session ID
+            round_number: Round being started
+            portfolio: Current portfolio positions
+            
+        Returns:
+            Round result, or None if a fresh round must be generated
+        """
+        prefetched = self._prefetched.pop((game_id, round_number), None)
+        if prefetched is None:
+            return None
+        
+        task, snapshot = prefetched
+        if snapshot != portfolio:
+            task.cancel()
+            return None
+        
+        try:
+            return await task
+        except Exception as e:
+            logger.warning("Prefetched round %s for game %s failed: %s", round_number, game_id, e)
+            return None
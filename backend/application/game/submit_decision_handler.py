@@ -1,10 +1,89 @@
 """Submit Decision Use Case Handler"""
 
-from typing import Dict
-from decimal import Decimal
-from backend.infrastructure.yfinance_adapter.historical_sampler import sample_historical_window
+import logging
+from typing import Dict, Tuple
+from infrastructure.yfinance_adapter.historical_sampler import sample_historical_window
 from application.portfolio.update_portfolio_handler import UpdatePortfolioHandler
-from infrastructure.observability.opik_tracer import log_game_event
+from infrastructure.observability.opik_tracer import log_game_event_background
+from infrastructure.round_outcome_writer import AsyncRoundOutcomeWriter
+from application.game.round_context import RoundContext
+
+logger = logging.getLogger(__name__)
+
+# Defaults for event fields missing from the round-start payload
+EVENT_DEFAULTS = {
+    "type": "UNKNOWN",
+    "description": "",
+    "horizon": 3,
+    "villain_stance": "Bullish",
+    "villain_bias": "Unknown",
+    "villain_hot_take": ""
+}
+
+
+def _return(start_price: float, end_price: float) -> float:
+    """Helper: Simple return between two prices (0.0 without a start price)"""
+    return (end_price - start_price) / start_price if start_price > 0 else 0.0
+
+
+def _pl_hold(allocation: float, entry_price: float, day0_price: float, day_h_price: float) -> float:
+    """Helper: Full position rides from entry to day H"""
+    return allocation * _return(entry_price, day_h_price)
+
+
+def _pl_sell_all(allocation: float, entry_price: float, day0_price: float, day_h_price: float) -> float:
+    """Helper: Full position realized at day 0"""
+    return allocation * _return(entry_price, day0_price)
+
+
+def _pl_sell_half(allocation: float, entry_price: float, day0_price: float, day_h_price: float) -> float:
+    """Helper: Half realized at day 0, half carried to day H"""
+    return allocation / 2 * (_return(entry_price, day0_price) + _return(entry_price, day_h_price))
+
+
+def _pl_buy(allocation: float, entry_price: float, day0_price: float, day_h_price: float) -> float:
+    """Helper: Added 10% rides from day 0 to day H"""
+    return allocation * 0.1 * _return(day0_price, day_h_price)
+
+
+def _pl_zero(allocation: float, entry_price: float, day0_price: float, day_h_price: float) -> float:
+    """Helper: Unknown decisions have no P/L"""
+    return 0.0
+
+
+# Decision -> P/L function (one dict lookup instead of a string-compare chain)
+_PL_CALCS = {
+    "HOLD": _pl_hold,
+    "SELL_ALL": _pl_sell_all,
+    "SELL_HALF": _pl_sell_half,
+    "BUY": _pl_buy
+}
+
+
+def calculate_round_pl(
+    decision: str,
+    allocation_before: float,
+    shares_before: float,
+    day0_price: float,
+    day_h_price: float
+) -> float:
+    """
+    Per-asset P/L in dollars for one round.
+    
+    Pure float kernel so it can be reused for replaying stored rounds.
+    
+    Args:
+        decision: SELL_ALL, SELL_HALF, HOLD, or BUY
+        allocation_before: Position allocation before the decision
+        shares_before: Position shares before the decision
+        day0_price: Historical price at decision time
+        day_h_price: Historical price at the end of the round horizon
+        
+    Returns:
+        P/L in dollars (0.0 for unknown decisions)
+    """
+    entry_price = (allocation_before / shares_before) if shares_before > 0 else 0.0
+    return _PL_CALCS.get(decision, _pl_zero)(allocation_before, entry_price, day0_price, day_h_price)
 
 
 class SubmitDecisionHandler:
@@ -14,19 +93,26 @@ class SubmitDecisionHandler:
     Process:
     1. Update portfolio in Supabase (UpdatePortfolioHandler)
     2. Calculate P/L based on actual price changes
-    3. Store round outcome to Supabase (game_rounds table)
+    3. Queue round outcome for Supabase (game_rounds table, written in batches)
     4. Log to Opik for observability
     
     Note: No longer uses agent graph for decision processing.
     Portfolio updates are handled directly via Supabase.
     """
     
-    def __init__(self, supabase_client=None):
+    def __init__(
+        self,
+        supabase_client=None,
+        round_writer: AsyncRoundOutcomeWriter = None,
+        round_context: RoundContext = None
+    ):
         # Supabase client for database operations
         self.supabase = supabase_client
+        # Write-behind buffer for game_rounds inserts (shared with the report handler)
+        self.round_writer = round_writer or (AsyncRoundOutcomeWriter(supabase_client) if supabase_client else None)
         self.update_portfolio_handler = UpdatePortfolioHandler(supabase_client)
-        self.game_repo = None  # TODO: remove after full Supabase migration
-        self.decision_tracker_repo = None  # TODO: remove after full Supabase migration
+        # Historical windows prefetched at round start
+        self.round_context = round_context
     
     async def execute(
         self,
@@ -61,27 +147,25 @@ class SubmitDecisionHandler:
         if not ticker or new_price is None:
             raise ValueError("ticker and new_price are required for portfolio updates")
         
-        # Step 1: Sample historical window for this round to drive per-asset movement
-        round_horizon = (event_data or {}).get("horizon", 3)
-        event_type = (event_data or {}).get("type", "UNKNOWN")
-        try:
-            hist_case = await sample_historical_window(ticker=ticker, event_type=event_type, horizon=round_horizon)
-            day0_price = Decimal(str(hist_case["day0_price"]))
-            day_h_price = Decimal(str(hist_case["day_h_price"]))
-        except Exception as e:
-            print(f"Warning: Failed to sample historical window: {e}")
-            # Fall back to provided new_price for a minimal flow
-            day0_price = Decimal(str(new_price))
-            day_h_price = Decimal(str(new_price))
-
-        # Decide which price to use to update state (end-of-round settlement)
-        # - SELL_ALL settles at day0 (exit now)
-        # - Others settle at day H (end of round)
-        state_settle_price = float(day0_price if player_decision == "SELL_ALL" else day_h_price)
-
-        # Step 2: Update portfolio state at the appropriate settlement price
+        # Normalize event fields once (defaults applied here, not per lookup)
+        event = {**EVENT_DEFAULTS, **event_data} if event_data else EVENT_DEFAULTS
+        
+        # Without a portfolio there is nothing to settle: P/L is zero and the
+        # historical sample / portfolio update are skipped entirely
         portfolio_update = None
+        pl_dollars = 0.0
+        pl_percent = 0.0
+        
         if portfolio_id:
+            # Step 1: Sample historical window for this round to drive per-asset movement
+            day0_price, day_h_price = await self._sample_round_prices(game_id, round_number, ticker, event, new_price)
+            
+            # Decide which price to use to update state (end-of-round settlement)
+            # - SELL_ALL settles at day0 (exit now)
+            # - Others settle at day H (end of round)
+            state_settle_price = day0_price if player_decision == "SELL_ALL" else day_h_price
+            
+            # Step 2: Update portfolio state at the appropriate settlement price
             try:
                 portfolio_update = await self.update_portfolio_handler.execute(
                     portfolio_id=portfolio_id,
@@ -92,67 +176,37 @@ class SubmitDecisionHandler:
                     round_number=round_number
                 )
             except Exception as e:
-                print(f"Warning: Portfolio update failed: {e}")
-
-        # Step 3: Compute per-asset P/L for this round using historical prices
-        # Use pre-update details to derive entry price
+                logger.warning("Portfolio update failed: %s", e)
+        
         if portfolio_update:
-            allocation_before = Decimal(str(portfolio_update.get("allocation_before", 0)))
-            shares_before = Decimal(str(portfolio_update.get("shares_before", 0)))
-        else:
-            allocation_before = Decimal("0")
-            shares_before = Decimal("0")
-
-        entry_price = (allocation_before / shares_before) if shares_before > 0 else Decimal("0")
-        round_pl_dollars = Decimal("0")
-        round_pl_percent = Decimal("0")
-
-        try:
-            if player_decision == "HOLD":
-                asset_return = (day_h_price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
-                round_pl_dollars = allocation_before * asset_return
-                round_pl_percent = asset_return
-            elif player_decision == "SELL_ALL":
-                asset_return = (day0_price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
-                round_pl_dollars = allocation_before * asset_return
-                round_pl_percent = asset_return
-            elif player_decision == "SELL_HALF":
-                half_alloc = allocation_before / Decimal("2")
-                ret_day0 = (day0_price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
-                ret_dayh = (day_h_price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
-                realized = half_alloc * ret_day0
-                unrealized = half_alloc * ret_dayh
-                round_pl_dollars = realized + unrealized
-                round_pl_percent = (round_pl_dollars / allocation_before) if allocation_before > 0 else Decimal("0")
-            elif player_decision == "BUY":
-                buy_size = allocation_before * Decimal("0.1")
-                buy_return = (day_h_price - day0_price) / day0_price if day0_price > 0 else Decimal("0")
-                round_pl_dollars = buy_size * buy_return
-                round_pl_percent = buy_return * Decimal("0.1")
-            else:
-                round_pl_dollars = Decimal("0")
-                round_pl_percent = Decimal("0")
-        except Exception as e:
-            print(f"Warning: Failed P/L computation: {e}")
-
-        # Calculate P/L percentage as pl_dollars / previous_total_portfolio_value
-        pl_dollars = float(round_pl_dollars)
-        previous_total_value = portfolio_update.get("previous_total_value", 0) if portfolio_update else 0
-        pl_percent = (pl_dollars / previous_total_value) if previous_total_value > 0 else 0.0
-        # Clean near-zero noise
-        if abs(pl_dollars) < 1e-9:
-            pl_dollars = 0.0
-        if abs(pl_percent) < 1e-9:
-            pl_percent = 0.0
+            # Step 3: Compute per-asset P/L for this round using historical prices
+            # Use pre-update details to derive entry price (plain floats: round
+            # returns don't need Decimal precision)
+            pl_dollars = calculate_round_pl(
+                player_decision,
+                float(portfolio_update.get("allocation_before", 0.0)),
+                float(portfolio_update.get("shares_before", 0.0)),
+                day0_price,
+                day_h_price
+            )
+            
+            # Calculate P/L percentage as pl_dollars / previous_total_portfolio_value
+            previous_total_value = portfolio_update.get("previous_total_value", 0)
+            pl_percent = (pl_dollars / previous_total_value) if previous_total_value > 0 else 0.0
+            # Clean near-zero noise
+            if abs(pl_dollars) < 1e-9:
+                pl_dollars = 0.0
+            if abs(pl_percent) < 1e-9:
+                pl_percent = 0.0
         
-        # Step 4: Store round outcome to Supabase
-        if self.supabase and event_data:
+        # Step 4: Queue round outcome for Supabase
+        if self.round_writer and event_data:
             try:
                 await self._save_round_outcome(
                     game_id=game_id,
                     round_number=round_number,
                     ticker=ticker,
-                    event_data=event_data,
+                    event=event,
                     player_decision=player_decision,
                     decision_time=decision_time,
                     opened_data_tab=opened_data_tab,
@@ -160,25 +214,22 @@ class SubmitDecisionHandler:
                     pl_percent=pl_percent
                 )
             except Exception as e:
-                print(f"Warning: Failed to save round outcome: {e}")
+                logger.warning("Failed to save round outcome: %s", e)
         
-        # Step 5: Log to Opik
-        try:
-            log_game_event("decision_submitted", {
-                "game_id": game_id,
-                "round_number": round_number,
-                "portfolio_id": portfolio_id,
-                "ticker": ticker,
-                "decision": player_decision,
-                "decision_time": decision_time,
-                "opened_data_tab": opened_data_tab,
-                "pl_dollars": pl_dollars,
-                "pl_percent": pl_percent,
-                "previous_total_value": portfolio_update["previous_total_value"] if portfolio_update else None,
-                "new_total_value": portfolio_update["new_total_value"] if portfolio_update else None
-            })
-        except Exception as e:
-            print(f"Warning: Failed to log to Opik: {e}")
+        # Step 5: Log to Opik (fire-and-forget, off the response path)
+        log_game_event_background("decision_submitted", {
+            "game_id": game_id,
+            "round_number": round_number,
+            "portfolio_id": portfolio_id,
+            "ticker": ticker,
+            "decision": player_decision,
+            "decision_time": decision_time,
+            "opened_data_tab": opened_data_tab,
+            "pl_dollars": pl_dollars,
+            "pl_percent": pl_percent,
+            "previous_total_value": portfolio_update["previous_total_value"] if portfolio_update else None,
+            "new_total_value": portfolio_update["new_total_value"] if portfolio_update else None
+        })
         
         return {
             "game_id": game_id,
@@ -190,12 +241,48 @@ class SubmitDecisionHandler:
             "behavior_flags": []  # TODO: Add behavioral analysis if needed
         }
     
+    async def _sample_round_prices(
+        self,
+        game_id: str,
+        round_number: int,
+        ticker: str,
+        event: Dict,
+        new_price: float
+    ) -> Tuple[float, float]:
+        """
+        Get the historical day-0 and day-H prices for this round.
+        
+        Uses the window prefetched at round start when available; otherwise
+        samples one now.
+        
+        Args:
+            game_id: Game session ID
+            round_number: Round number
+            ticker: Stock ticker
+            event: Normalized event data (type and horizon)
+            new_price: Current price, used for both if sampling fails
+            
+        Returns:
+            (day0_price, day_h_price)
+        """
+        try:
+            hist_case = None
+            if self.round_context:
+                hist_case = await self.round_context.take_window(game_id, round_number, ticker)
+            if hist_case is None:
+                hist_case = await sample_historical_window(ticker=ticker, event_type=event["type"], horizon=event["horizon"])
+            return float(hist_case["day0_price"]), float(hist_case["day_h_price"])
+        except Exception as e:
+            logger.warning("Failed to sample historical window: %s", e)
+            # Fall back to provided new_price for a minimal flow
+            return float(new_price), float(new_price)
+    
     async def _save_round_outcome(
         self,
         game_id: str,
         round_number: int,
         ticker: str,
-        event_data: Dict,
+        event: Dict,
         player_decision: str,
         decision_time: float,
         opened_data_tab: bool,
@@ -203,41 +290,35 @@ class SubmitDecisionHandler:
         pl_percent: float
     ) -> None:
         """
-        Save round outcome to game_rounds table.
+        Queue round outcome for the game_rounds table.
+        
+        The row is written in the background by the round writer; unknown
+        sessions are rejected by the session_id foreign key and logged there.
         
         Args:
             game_id: Game session ID
             round_number: Round number
             ticker: Stock ticker
-            event_data: Event data from round start
+            event: Event data from round start, with EVENT_DEFAULTS applied
             player_decision: Player's decision
             decision_time: Time taken to decide
             opened_data_tab: Whether player opened data tab
             pl_dollars: Profit/loss in dollars
             pl_percent: Profit/loss percentage
         """
-        # Fetch session_id from game_sessions
-        session_response = self.supabase.table("game_sessions").select("id").eq("id", game_id).execute()
-        
-        if not session_response.data or len(session_response.data) == 0:
-            print(f"Warning: Game session {game_id} not found, skipping round outcome save")
-            return
-        
-        # Insert round outcome
-        self.supabase.table("game_rounds").insert({
+        await self.round_writer.enqueue({
             "session_id": game_id,
             "round_number": round_number,
             "ticker": ticker,
-            "event_type": event_data.get("type", "UNKNOWN"),
-            "event_description": event_data.get("description", ""),
-            "event_horizon": event_data.get("horizon", 3),
-            "villain_stance": event_data.get("villain_stance", "Bullish"),
-            "villain_bias": event_data.get("villain_bias", "Unknown"),
-            "villain_hot_take": event_data.get("villain_hot_take", ""),
+            "event_type": event["type"],
+            "event_description": event["description"],
+            "event_horizon": event["horizon"],
+            "villain_stance": event["villain_stance"],
+            "villain_bias": event["villain_bias"],
+            "villain_hot_take": event["villain_hot_take"],
             "player_decision": player_decision,
             "decision_time": decision_time,
             "opened_data_tab": opened_data_tab,
             "pl_dollars": pl_dollars,
             "pl_percent": pl_percent
-        }).execute()
-
+        })
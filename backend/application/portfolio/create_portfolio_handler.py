@@ -1,10 +1,11 @@
 """Create Portfolio Use Case Handler"""
 
 from typing import List, Dict
-import uuid
 from domain.portfolio.portfolio import Portfolio
 from domain.portfolio.risk_profile import RiskProfile
-from infrastructure.yfinance_adapter.price_fetcher import get_current_price
+from infrastructure.yfinance_adapter.price_fetcher import get_current_prices
+from infrastructure.ids import uuid7
+from infrastructure.clients import run_query
 
 
 class CreatePortfolioHandler:
@@ -43,18 +44,24 @@ class CreatePortfolioHandler:
         if abs(total_allocation - 1_000_000) > 1:
             raise ValueError(f"Total allocation must be $1,000,000, got ${total_allocation:,.0f}")
         
-        # Create portfolio aggregate
+        # Create portfolio aggregate (time-ordered id keeps portfolios inserts index-local)
         portfolio = Portfolio(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),
             player_id=player_id,
             risk_profile=RiskProfile(risk_profile)
         )
         
-        # Add positions (fetch current prices)
+        # Fetch current prices in one batched request (cached briefly across players)
+        prices = await get_current_prices(tickers)
+        
+        failures = [ticker for ticker in tickers if ticker not in prices]
+        if failures:
+            raise ValueError(f"No price data available for: {', '.join(failures)}")
+        
+        # Add positions
         for ticker in tickers:
             try:
-                entry_price = await get_current_price(ticker)
-                portfolio.add_position(ticker, allocations[ticker], entry_price)
+                portfolio.add_position(ticker, allocations[ticker], prices[ticker])
             except Exception as e:
                 raise ValueError(f"Failed to add position for {ticker}: {str(e)}")
         
@@ -63,7 +70,7 @@ class CreatePortfolioHandler:
         
         # Save to Supabase
         if self.supabase:
-            await self._save_to_supabase(portfolio)
+            await self._save_to_supabase(portfolio, total_value)
         
         # Save to repository (legacy, TODO: remove)
         if self.portfolio_repo:
@@ -86,32 +93,34 @@ class CreatePortfolioHandler:
             "total_value": total_value
         }
     
-    async def _save_to_supabase(self, portfolio: Portfolio) -> None:
+    async def _save_to_supabase(self, portfolio: Portfolio, total_value: float) -> None:
         """
         Save portfolio and positions to Supabase.
         
         Args:
             portfolio: Portfolio aggregate to save
+            total_value: Portfolio total value (already computed by the caller)
         """
         # Insert portfolio record
-        self.supabase.table("portfolios").insert({
+        await run_query(self.supabase.table("portfolios").insert({
             "id": portfolio.id,
             "player_id": portfolio.player_id,
             "risk_profile": str(portfolio.risk_profile.value),
             "tickers": [p.ticker for p in portfolio.positions],
-            "allocations": {p.ticker: float(p.allocation) for p in portfolio.positions},
-            "cash": float(portfolio.cash),
-            "total_value": float(portfolio.calculate_total_value())
-        }).execute()
+            "allocations": {p.ticker: p.allocation for p in portfolio.positions},
+            "cash": portfolio.cash,
+            "total_value": total_value
+        }))
         
-        # Insert positions
-        for position in portfolio.positions:
-            self.supabase.table("positions").insert({
+        # Insert all positions in one bulk request
+        await run_query(self.supabase.table("positions").insert([
+            {
                 "portfolio_id": portfolio.id,
                 "ticker": position.ticker,
-                "shares": float(position.shares),
-                "entry_price": float(position.entry_price),
-                "current_price": float(position.current_price),
-                "allocation": float(position.allocation)
-            }).execute()
-
+                "shares": position.shares,
+                "entry_price": position.entry_price,
+                "current_price": position.current_price,
+                "allocation": position.allocation
+            }
+            for position in portfolio.positions
+        ]))
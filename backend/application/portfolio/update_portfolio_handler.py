@@ -1,12 +1,78 @@
 """Update Portfolio Use Case Handler"""
 
-from typing import Dict, Optional
-from decimal import Decimal
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from domain.portfolio.portfolio import Portfolio
 from domain.portfolio.position import Position
 from domain.portfolio.risk_profile import RiskProfile
-from infrastructure.observability.opik_tracer import log_game_event
+from infrastructure.observability.opik_tracer import log_game_event_background
+from infrastructure.clients import run_query
 
+# Portfolios this process last saved, served instead of re-reading them on
+# the player's next decision
+PORTFOLIO_CACHE_TTL = 300  # seconds
+PORTFOLIO_CACHE_SIZE = 1000
+
+# portfolio_id -> (saved_at, portfolio), oldest first
+_portfolio_cache: "OrderedDict[str, Tuple[float, Portfolio]]" = OrderedDict()
+
+
+@lru_cache(maxsize=8)
+def _risk_profile(value: str) -> RiskProfile:
+    """Helper: Shared RiskProfile per stored value (it's immutable, only a few values exist)"""
+    return RiskProfile(value)
+
+
+def _clean_number(value: float) -> float:
+    """Helper: Normalize tiny negative zeros for cleaner UI"""
+    return 0.0 if abs(value) < 1e-9 else float(value)
+
+
+def _apply_sell_all(portfolio: Portfolio, ticker: str, new_price: float) -> Tuple[float, float, float]:
+    """Helper: Exit at the new price; no P/L (exit before any price movement)"""
+    # Ensure we settle at the provided new_price for realized value
+    portfolio.apply_hold(ticker, new_price)
+    portfolio.apply_sell_all(ticker)
+    return 0.0, 0.0, 0.0
+
+
+def _apply_sell_half(portfolio: Portfolio, ticker: str, new_price: float) -> Tuple[float, float, float]:
+    """Helper: Realize half at the new price; the remaining half rides the price change"""
+    portfolio.apply_sell_half(ticker)
+    # Ensure remaining half reflects the latest market price
+    portfolio.apply_hold(ticker, new_price)
+    position_after = portfolio.get_position(ticker)
+    # P/L is 0 on the sold half; the remaining half has P/L from entry
+    pl_dollars = position_after.calculate_value() - position_after.allocation
+    return pl_dollars, position_after.shares, position_after.allocation
+
+
+def _apply_hold(portfolio: Portfolio, ticker: str, new_price: float) -> Tuple[float, float, float]:
+    """Helper: Full position rides the price change from entry to the new price"""
+    portfolio.apply_hold(ticker, new_price)
+    position_after = portfolio.get_position(ticker)
+    pl_dollars = position_after.calculate_value() - position_after.allocation
+    return pl_dollars, position_after.shares, position_after.allocation
+
+
+def _apply_buy(portfolio: Portfolio, ticker: str, new_price: float) -> Tuple[float, float, float]:
+    """Helper: Add 10% to the position at the new price"""
+    portfolio.apply_buy(ticker, new_price)
+    position_after = portfolio.get_position(ticker)
+    # Just bought at the current price, so no gain/loss yet; it is realized
+    # when the price changes in future rounds
+    return 0.0, position_after.shares, position_after.allocation
+
+
+# Decision -> (pl_dollars, shares_after, allocation_after) after applying it
+_DECISION_HANDLERS = {
+    "SELL_ALL": _apply_sell_all,
+    "SELL_HALF": _apply_sell_half,
+    "HOLD": _apply_hold,
+    "BUY": _apply_buy
+}
 
 class UpdatePortfolioHandler:
     """
@@ -56,133 +122,65 @@ class UpdatePortfolioHandler:
         if not position_before:
             raise ValueError(f"Position not found for ticker: {ticker}")
         
-        value_before = position_before.calculate_value()
         shares_before = position_before.shares
         allocation_before = position_before.allocation
+        price_before = position_before.current_price
         
         # Calculate previous total portfolio value before any updates
         previous_total_value = portfolio.calculate_total_value()
         
         # Step 3: Apply decision to portfolio and calculate P/L correctly
-        pl_dollars = Decimal(0)
-        pl_percent = Decimal(0)
-        shares_after = Decimal(0)
-        allocation_after = Decimal(0)
-        
-        if decision == "SELL_ALL":
-            # SELL_ALL: Exit at current price, no P/L (exit before any price movement)
-            # Ensure we settle at the provided new_price for realized value
-            position_now = portfolio.get_position(ticker)
-            if position_now:
-                position_now.update_price(new_price)
-            portfolio.apply_sell_all(ticker)
-            pl_dollars = Decimal(0)
-            pl_percent = Decimal(0)
-            shares_after = Decimal(0)
-            allocation_after = Decimal(0)
-            
-        elif decision == "SELL_HALF":
-            # SELL_HALF: Realize half at current price, remaining half rides price change
-            portfolio.apply_sell_half(ticker)
-            position_after = portfolio.get_position(ticker)
-            if position_after:
-                # Ensure remaining half reflects the latest market price
-                position_after.update_price(new_price)
-                shares_after = position_after.shares
-                allocation_after = position_after.allocation
-                # P/L is the gain/loss on the remaining half that rides the price change
-                # Since we just sold half at current price, P/L is 0 on the sold half
-                # The remaining half will have P/L based on price change from entry
-                pl_dollars = position_after.calculate_value() - position_after.allocation
-                pl_percent = pl_dollars / position_after.allocation if position_after.allocation > 0 else Decimal(0)
-            
-        elif decision == "HOLD":
-            # HOLD: Full position rides price change from entry to current price
-            portfolio.apply_hold(ticker, new_price)
-            position_after = portfolio.get_position(ticker)
-            shares_after = position_after.shares
-            allocation_after = position_after.allocation
-            # P/L is the gain/loss from entry price to current price
-            pl_dollars = position_after.calculate_value() - position_after.allocation
-            pl_percent = pl_dollars / position_after.allocation if position_after.allocation > 0 else Decimal(0)
-            
-        elif decision == "BUY":
-            # BUY: Add 10% to position, calculate P/L on the additional 10%
-            amount_spent = portfolio.apply_buy(ticker, new_price)
-            position_after = portfolio.get_position(ticker)
-            shares_after = position_after.shares
-            allocation_after = position_after.allocation
-            
-            # P/L is the gain/loss on the additional 10% purchased
-            # Since we just bought at current price, P/L is 0 (no gain/loss yet)
-            # The actual P/L will be realized when the price changes in future rounds
-            pl_dollars = Decimal(0)
-            pl_percent = Decimal(0)
-            
-        else:
+        apply_decision = _DECISION_HANDLERS.get(decision)
+        if not apply_decision:
             raise ValueError(f"Invalid decision: {decision}")
         
+        pl_dollars, shares_after, allocation_after = apply_decision(portfolio, ticker, new_price)
+        
         # Step 4: Calculate new portfolio value
         new_total_value = portfolio.calculate_total_value()
         
-        # Step 4.5: Recalculate pl_percent using portfolio-based calculation
-        # Override the position-based calculation with portfolio-based calculation
-        pl_percent = (pl_dollars / previous_total_value) if previous_total_value > 0 else Decimal(0)
+        # Step 4.5: P/L percent relative to the whole portfolio
+        pl_percent = (pl_dollars / previous_total_value) if previous_total_value > 0 else 0.0
         
-        # Step 5: Persist to Supabase
-        await self._save_portfolio(portfolio)
+        # Step 5: Log to Opik (fire-and-forget, so it overlaps the save below)
+        log_game_event_background("portfolio_updated", {
+            "game_id": game_id,
+            "round_number": round_number,
+            "portfolio_id": portfolio_id,
+            "ticker": ticker,
+            "decision": decision,
+            "shares_before": shares_before,
+            "shares_after": shares_after,
+            "allocation_before": allocation_before,
+            "allocation_after": allocation_after,
+            "pl_dollars": pl_dollars,
+            "new_total_value": new_total_value,
+            "new_price": new_price,
+            "cash": portfolio.cash
+        })
         
-        # Step 6: Log to Opik
-        try:
-            log_game_event("portfolio_updated", {
-                "game_id": game_id,
-                "round_number": round_number,
-                "portfolio_id": portfolio_id,
-                "ticker": ticker,
-                "decision": decision,
-                "shares_before": float(shares_before),
-                "shares_after": float(shares_after),
-                "allocation_before": float(allocation_before),
-                "allocation_after": float(allocation_after),
-                "pl_dollars": float(pl_dollars),
-                "new_total_value": float(new_total_value),
-                "new_price": new_price,
-                "cash": float(portfolio.cash)
-            })
-        except Exception as e:
-            print(f"Warning: Failed to log to Opik: {e}")
+        # Step 6: Persist to Supabase (a HOLD at the stored price changes
+        # nothing, so skip the write)
+        if decision == "HOLD" and float(new_price) == price_before:
+            self._cache_portfolio(portfolio)
+        else:
+            await self._save_portfolio(portfolio, new_total_value)
         
         # Step 7: Return result
-        # Normalize tiny negative zeros for cleaner UI
-        def _clean_number(value: Decimal | float) -> float:
-            v = float(value)
-            if abs(v) < 1e-9:
-                return 0.0
-            return v
-
         result = {
             "portfolio_id": portfolio_id,
             "ticker": ticker,
             "decision": decision,
             "pl_dollars": _clean_number(pl_dollars),
             "pl_percent": _clean_number(pl_percent),
-            "shares_before": float(shares_before),
-            "shares_after": float(shares_after),
-            "allocation_before": float(allocation_before),
-            "allocation_after": float(allocation_after),
+            "shares_before": shares_before,
+            "shares_after": shares_after,
+            "allocation_before": allocation_before,
+            "allocation_after": allocation_after,
             "previous_total_value": _clean_number(previous_total_value),
             "new_total_value": _clean_number(new_total_value),
-            "cash": float(portfolio.cash),
-            "positions": [
-                {
-                    "ticker": p.ticker,
-                    "shares": float(p.shares),
-                    "current_price": float(p.current_price),
-                    "allocation": float(p.allocation),
-                    "value": float(p.calculate_value())
-                }
-                for p in portfolio.positions
-            ]
+            "cash": portfolio.cash,
+            "positions": [p.to_summary() for p in portfolio.positions]
         }
 
         # Also return a minimal mirror for in-memory cache updates
@@ -203,95 +201,121 @@ class UpdatePortfolioHandler:
         Returns:
             Portfolio aggregate
         """
+        # Take the cached copy out while it is being mutated in place. It is
+        # only re-cached after the save has landed (or when a HOLD needs no
+        # save), so an update that raises falls back to the saved row
+        cached = _portfolio_cache.pop(portfolio_id, None)
+        if cached and time.monotonic() - cached[0] < PORTFOLIO_CACHE_TTL:
+            return cached[1]
+        
+        portfolios = await self._fetch_portfolios([portfolio_id])
+        
+        if portfolio_id not in portfolios:
+            raise ValueError(f"Portfolio not found: {portfolio_id}")
+        
+        return portfolios[portfolio_id]
+    
+    async def _fetch_portfolios(self, portfolio_ids: List[str]) -> Dict[str, Portfolio]:
+        """
+        Fetch several portfolios from Supabase in one request.
+        
+        Args:
+            portfolio_ids: Portfolio IDs
+            
+        Returns:
+            Dict of {portfolio_id: Portfolio} (unknown IDs are omitted)
+        """
         if not self.supabase:
             raise ValueError("Supabase client not configured")
         
-        # Fetch portfolio record
-        portfolio_response = self.supabase.table("portfolios").select("*").eq("id", portfolio_id).execute()
+        if not portfolio_ids:
+            return {}
         
-        if not portfolio_response.data or len(portfolio_response.data) == 0:
-            raise ValueError(f"Portfolio not found: {portfolio_id}")
+        # Fetch portfolio records with their positions embedded (one PostgREST
+        # request, joined server-side over the positions.portfolio_id FK)
+        response = await run_query(
+            self.supabase.table("portfolios").select("*, positions(*)").in_("id", list(portfolio_ids))
+        )
         
-        portfolio_data = portfolio_response.data[0]
+        portfolios = {}
+        for portfolio_data in response.data or []:
+            portfolio = self._build_portfolio(portfolio_data)
+            portfolios[portfolio.id] = portfolio
         
-        # Fetch positions
-        positions_response = self.supabase.table("positions").select("*").eq("portfolio_id", portfolio_id).execute()
+        return portfolios
+    
+    @staticmethod
+    def _build_portfolio(portfolio_data: Dict) -> Portfolio:
+        """Helper: Reconstruct a Portfolio aggregate from a portfolios row with embedded positions"""
+        positions_data = portfolio_data.get("positions") or []
         
-        # Reconstruct Portfolio aggregate
         # Get actual initial cash from portfolio data or calculate from positions
         initial_cash = portfolio_data.get("initial_cash", 1_000_000)
         if not initial_cash or initial_cash <= 0:
             # Calculate initial cash from current positions + cash
-            total_allocations = sum(float(pos["allocation"]) for pos in positions_response.data) if positions_response.data else 0
+            total_allocations = sum(float(pos["allocation"]) for pos in positions_data)
             current_cash = float(portfolio_data.get("cash", 0))
             initial_cash = total_allocations + current_cash
         
         portfolio = Portfolio(
             id=portfolio_data["id"],
             player_id=portfolio_data["player_id"],
-            risk_profile=RiskProfile(portfolio_data["risk_profile"]),
+            risk_profile=_risk_profile(portfolio_data["risk_profile"]),
             initial_cash=float(initial_cash)
         )
         
         # Reconstruct positions
-        for pos_data in positions_response.data:
+        for pos_data in positions_data:
             position = Position(
                 ticker=pos_data["ticker"],
                 allocation=float(pos_data["allocation"]),
                 entry_price=float(pos_data["entry_price"])
             )
-            position.shares = Decimal(str(pos_data["shares"]))
-            position.current_price = Decimal(str(pos_data["current_price"]))
+            position.shares = float(pos_data["shares"])
+            position.current_price = float(pos_data["current_price"])
             portfolio._positions.append(position)
+            portfolio._by_ticker[position.ticker] = position
         
         # Set cash
-        portfolio._cash = Decimal(str(portfolio_data["cash"]))
+        portfolio._cash = float(portfolio_data["cash"])
         
         return portfolio
     
-    async def _save_portfolio(self, portfolio: Portfolio) -> None:
+    async def _save_portfolio(self, portfolio: Portfolio, total_value: float) -> None:
         """
         Save portfolio to Supabase.
         
         Args:
             portfolio: Portfolio aggregate to save
+            total_value: Portfolio total value (already computed by the caller)
         """
         if not self.supabase:
             raise ValueError("Supabase client not configured")
         
-        # Update portfolio record
-        self.supabase.table("portfolios").update({
-            "cash": float(portfolio.cash),
-            "total_value": float(portfolio.calculate_total_value())
-        }).eq("id", portfolio.id).execute()
-        
-        # Update or insert positions
-        for position in portfolio.positions:
-            # Try to update first
-            result = self.supabase.table("positions").update({
-                "shares": float(position.shares),
-                "current_price": float(position.current_price),
-                "allocation": float(position.allocation)
-            }).eq("portfolio_id", portfolio.id).eq("ticker", position.ticker).execute()
-            
-            # If no rows updated, insert new position
-            if not result.data or len(result.data) == 0:
-                self.supabase.table("positions").insert({
-                    "portfolio_id": portfolio.id,
+        # Portfolio row, position upserts and sold-out deletions in one
+        # transactional RPC
+        await run_query(self.supabase.rpc("save_portfolio_state", {
+            "portfolio_id": portfolio.id,
+            "cash": portfolio.cash,
+            "total_value": total_value,
+            "positions": [
+                {
                     "ticker": position.ticker,
-                    "shares": float(position.shares),
-                    "entry_price": float(position.entry_price),
-                    "current_price": float(position.current_price),
-                    "allocation": float(position.allocation)
-                }).execute()
-        
-        # Delete positions that were sold completely
-        # Fetch all positions for this portfolio
-        all_positions = self.supabase.table("positions").select("ticker").eq("portfolio_id", portfolio.id).execute()
+                    "shares": position.shares,
+                    "entry_price": position.entry_price,
+                    "current_price": position.current_price,
+                    "allocation": position.allocation
+                }
+                for position in portfolio.positions
+            ]
+        }))
         
-        if all_positions.data:
-            existing_tickers = [p.ticker for p in portfolio.positions]
-            # Delete each position that's not in the current portfolio
-            for pos in all_positions.data:
-                if pos["ticker"] not in existing_tickers:
-                    self.supabase.table("positions").delete().eq("portfolio_id", portfolio.id).eq("ticker", pos["ticker"]).execute()
+        # Write-through: the next update for this portfolio skips the read
+        self._cache_portfolio(portfolio)
+    
+    @staticmethod
+    def _cache_portfolio(portfolio: Portfolio) -> None:
+        """Helper: Store a portfolio that matches its saved state"""
+        _portfolio_cache[portfolio.id] = (time.monotonic(), portfolio)
+        while len(_portfolio_cache) > PORTFOLIO_CACHE_SIZE:
+            _portfolio_cache.popitem(last=False)
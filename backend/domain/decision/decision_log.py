@@ -4,6 +4,13 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any
 
+# Decisions that side with a bearish or bullish stance
+SELL_DECISIONS = frozenset({"SELL_ALL", "SELL_HALF"})
+STAY_DECISIONS = frozenset({"HOLD", "BUY"})
+
+# Contradiction score above which following/resisting the Villain is flagged
+HIGH_CONTRADICTION = 0.7
+
 
 @dataclass
 class DecisionLog:
@@ -32,34 +39,71 @@ class DecisionLog:
     
     def flag_panic_sell(self, price_pattern: str):
         """Flag if player panic-sold after down days"""
-        if self.player_decision == "SELL_ALL" and "3_down_closes" in price_pattern:
-            self.behavior_flags.append("panic_sell")
+        self._apply_flag("panic_sell", price_pattern)
     
     def flag_chased_spike(self, price_pattern: str):
         """Flag if player chased after up moves"""
-        if self.player_decision == "BUY" and "3_up_closes" in price_pattern:
-            self.behavior_flags.append("chased_spike")
+        self._apply_flag("chased_spike", price_pattern)
     
     def flag_ignored_data(self):
         """Flag if player didn't check data"""
-        if not self.opened_data_tab:
-            self.behavior_flags.append("ignored_data")
+        self._apply_flag("ignored_data")
     
     def flag_followed_villain_high_contradiction(self):
         """Flag if player followed Villain when headlines strongly disagreed"""
-        if self.contradiction_score > 0.7:
-            villain_stance = self.villain_take.get("stance", "")
-            if (villain_stance == "Bullish" and self.player_decision == "BUY") or \
-               (villain_stance == "Bearish" and self.player_decision in ["SELL_ALL", "SELL_HALF"]):
-                self.behavior_flags.append("followed_villain_high_contradiction")
+        self._apply_flag("followed_villain_high_contradiction")
     
     def flag_resisted_villain(self):
         """Flag if player resisted Villain under high contradiction"""
-        if self.contradiction_score > 0.7:
+        self._apply_flag("resisted_villain")
+    
+    def evaluate_flags(self, price_pattern: str) -> List[str]:
+        """
+        Apply every behavior flag check in one pass
+        
+        Args:
+            price_pattern: Recent price pattern (e.g. "3_down_closes")
+            
+        Returns:
+            behavior_flags after evaluation
+        """
+        self.behavior_flags.extend(self._compute_flags(price_pattern))
+        return self.behavior_flags
+    
+    def _apply_flag(self, flag: str, price_pattern: str = ""):
+        """Helper: Append a single flag if the shared rules raise it"""
+        if flag in self._compute_flags(price_pattern):
+            self.behavior_flags.append(flag)
+    
+    def _compute_flags(self, price_pattern: str) -> List[str]:
+        """
+        Helper: Behavior flags for this decision, in reporting order
+        
+        Single copy of the flag rules; reads the decision, Villain stance
+        and contradiction score once.
+        """
+        decision = self.player_decision
+        flags = []
+        
+        if decision == "SELL_ALL" and "3_down_closes" in price_pattern:
+            flags.append("panic_sell")
+        elif decision == "BUY" and "3_up_closes" in price_pattern:
+            flags.append("chased_spike")
+        
+        if not self.opened_data_tab:
+            flags.append("ignored_data")
+        
+        if self.contradiction_score > HIGH_CONTRADICTION:
             villain_stance = self.villain_take.get("stance", "")
-            if (villain_stance == "Bearish" and self.player_decision in ["HOLD", "BUY"]) or \
-               (villain_stance == "Bullish" and self.player_decision in ["SELL_ALL", "SELL_HALF"]):
-                self.behavior_flags.append("resisted_villain")
+            sold = decision in SELL_DECISIONS
+            if (villain_stance == "Bullish" and decision == "BUY") or \
+               (villain_stance == "Bearish" and sold):
+                flags.append("followed_villain_high_contradiction")
+            if (villain_stance == "Bearish" and decision in STAY_DECISIONS) or \
+               (villain_stance == "Bullish" and sold):
+                flags.append("resisted_villain")
+        
+        return flags
     
     def to_dict(self) -> dict:
         return {
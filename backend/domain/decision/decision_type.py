@@ -17,10 +17,12 @@ class DecisionType(str, Enum):
     @property
     def display_name(self) -> str:
         """Human-readable name"""
-        return {
-            "SELL_ALL": "Sell All",
-            "SELL_HALF": "Sell Half",
-            "HOLD": "Hold",
-            "BUY": "Buy"
-        }[self.value]
+        return _DISPLAY_NAMES[self.value]
 
+
+_DISPLAY_NAMES = {
+    "SELL_ALL": "Sell All",
+    "SELL_HALF": "Sell Half",
+    "HOLD": "Hold",
+    "BUY": "Buy"
+}
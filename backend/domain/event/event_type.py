@@ -16,15 +16,17 @@ class EventType(str, Enum):
     @property
     def default_horizon(self) -> int:
         """Default time horizon for this event type (trading days)"""
-        return {
-            "EARNINGS_SURPRISE": 3,
-            "REGULATORY_NEWS": 5,
-            "ANALYST_ACTION": 3,
-            "VOLATILITY_SPIKE": 2,
-            "PRODUCT_NEWS": 4,
-            "MACRO_EVENT": 5
-        }[self.value]
+        return _DEFAULT_HORIZONS[self.value]
     
     def __str__(self) -> str:
         return self.value
 
+
+_DEFAULT_HORIZONS = {
+    "EARNINGS_SURPRISE": 3,
+    "REGULATORY_NEWS": 5,
+    "ANALYST_ACTION": 3,
+    "VOLATILITY_SPIKE": 2,
+    "PRODUCT_NEWS": 4,
+    "MACRO_EVENT": 5
+}
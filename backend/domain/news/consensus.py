@@ -1,5 +1,6 @@
 """Consensus value object"""
 
+from collections import Counter
 from dataclasses import dataclass
 from typing import List
 from .headline import Headline
@@ -18,8 +19,10 @@ class Consensus:
         if not headlines:
             return Consensus("No Data")
         
-        bull_count = sum(1 for h in headlines if h.stance == NewsStance.BULL)
-        bear_count = sum(1 for h in headlines if h.stance == NewsStance.BEAR)
+        # Tally every stance in one pass
+        stance_counts = Counter(h.stance for h in headlines)
+        bull_count = stance_counts[NewsStance.BULL]
+        bear_count = stance_counts[NewsStance.BEAR]
         total = len(headlines)
         
         bull_pct = bull_count / total
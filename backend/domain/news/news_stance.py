@@ -16,9 +16,11 @@ class NewsStance(str, Enum):
     @property
     def emoji(self) -> str:
         """Visual emoji for UI"""
-        return {
-            "Bull": "🟢",
-            "Bear": "🔴",
-            "Neutral": "⚪"
-        }[self.value]
+        return _EMOJIS[self.value]
 
+
+_EMOJIS = {
+    "Bull": "🟢",
+    "Bear": "🔴",
+    "Neutral": "⚪"
+}
@@ -1,7 +1,6 @@
 """Portfolio aggregate root"""
 
-from decimal import Decimal
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 
 from ..exceptions import (
@@ -32,9 +31,14 @@ class Portfolio:
         self.id = str(id) if not isinstance(id, str) else id
         self.player_id = player_id
         self.risk_profile = risk_profile
-        self.initial_cash = Decimal(str(initial_cash))
+        self.initial_cash = float(initial_cash)
         self._positions: List[Position] = []
+        # ticker -> position in _positions, kept in sync for O(1) lookups
+        self._by_ticker: Dict[str, Position] = {}
         self._cash = self.initial_cash
+        # Cached calculate_total_value() result; reset by every mutation below,
+        # so positions must only be changed through Portfolio methods
+        self._total_value: Optional[float] = None
         self._validate_invariants()
     
     def _validate_invariants(self):
@@ -67,19 +71,19 @@ class Portfolio:
             InsufficientFundsError: Not enough cash
             InvalidAllocationError: Exceeds risk profile limits
         """
-        allocation_decimal = Decimal(str(allocation))
+        allocation = float(allocation)
         
         # Check sufficient cash
-        if allocation_decimal > self._cash:
+        if allocation > self._cash:
             raise InsufficientFundsError(
-                f"Insufficient cash: ${float(self._cash):.2f} < ${allocation:.2f}"
+                f"Insufficient cash: ${self._cash:.2f} < ${allocation:.2f}"
             )
         
         # Check risk profile limits
         max_pct = self.risk_profile.max_position_size_pct
-        max_allocation = self.initial_cash * Decimal(str(max_pct))
+        max_allocation = self.initial_cash * max_pct
         
-        if allocation_decimal > max_allocation:
+        if allocation > max_allocation:
             raise InvalidAllocationError(
                 f"Position exceeds {max_pct*100:.0f}% limit for {self.risk_profile.value}"
             )
@@ -87,20 +91,24 @@ class Portfolio:
         # Create position
         position = Position(ticker, allocation, entry_price)
         self._positions.append(position)
-        self._cash -= allocation_decimal
+        self._by_ticker[ticker] = position
+        self._cash -= allocation
+        self._total_value = None
         
         return position
     
     def get_position(self, ticker: str) -> Position | None:
         """Get position by ticker"""
-        return next((p for p in self._positions if p.ticker == ticker), None)
+        return self._by_ticker.get(ticker)
     
-    def calculate_total_value(self) -> Decimal:
+    def calculate_total_value(self) -> float:
         """Calculate current total portfolio value"""
-        positions_value = sum(p.calculate_value() for p in self._positions)
-        return positions_value + self._cash
+        if self._total_value is None:
+            positions_value = sum(p.calculate_value() for p in self._positions)
+            self._total_value = positions_value + self._cash
+        return self._total_value
     
-    def apply_sell_all(self, ticker: str) -> Decimal:
+    def apply_sell_all(self, ticker: str) -> float:
         """
         Apply SELL_ALL decision
         
@@ -116,10 +124,12 @@ class Portfolio:
         value = position.calculate_value()
         self._cash += value
         self._positions.remove(position)
+        del self._by_ticker[ticker]
+        self._total_value = None
         
         return value
     
-    def apply_sell_half(self, ticker: str) -> Decimal:
+    def apply_sell_half(self, ticker: str) -> float:
         """
         Apply SELL_HALF decision
         
@@ -132,14 +142,15 @@ class Portfolio:
         if not position:
             raise PositionNotFoundError(f"Position not found: {ticker}")
         
-        half_value = position.calculate_value() / Decimal(2)
+        half_value = position.calculate_value() / 2
         
         # Update position
-        position.shares = position.shares / Decimal(2)
-        position.allocation = position.allocation / Decimal(2)
+        position.shares = position.shares / 2
+        position.allocation = position.allocation / 2
         
         # Add to cash
         self._cash += half_value
+        self._total_value = None
         
         return half_value
     
@@ -154,8 +165,9 @@ class Portfolio:
             raise PositionNotFoundError(f"Position not found: {ticker}")
         
         position.update_price(new_price)
+        self._total_value = None
     
-    def apply_buy(self, ticker: str, new_price: float) -> Decimal:
+    def apply_buy(self, ticker: str, new_price: float) -> float:
         """
         Apply BUY decision
         
@@ -169,18 +181,19 @@ class Portfolio:
             raise PositionNotFoundError(f"Position not found: {ticker}")
         
         # Calculate 10% addition
-        buy_amount = position.allocation * Decimal("0.1")
+        buy_amount = position.allocation * 0.1
         
         if buy_amount > self._cash:
             raise InsufficientFundsError("Insufficient cash for buy")
         
         # Update position
-        position.shares += buy_amount / Decimal(str(new_price))
+        position.shares += buy_amount / new_price
         position.allocation += buy_amount
         position.update_price(new_price)
         
         # Reduce cash
         self._cash -= buy_amount
+        self._total_value = None
         
         return buy_amount
     
@@ -195,7 +208,7 @@ class Portfolio:
         return [p.ticker for p in self._positions]
     
     @property
-    def cash(self) -> Decimal:
+    def cash(self) -> float:
         """Get current cash"""
         return self._cash
     
@@ -205,13 +218,13 @@ class Portfolio:
             "id": self.id,
             "player_id": self.player_id,
             "risk_profile": str(self.risk_profile),
-            "initial_cash": float(self.initial_cash),
-            "current_cash": float(self._cash),
+            "initial_cash": self.initial_cash,
+            "current_cash": self._cash,
             "positions": [p.to_dict() for p in self._positions],
-            "total_value": float(self.calculate_total_value()),
+            "total_value": self.calculate_total_value(),
             "tickers": self.tickers
         }
     
     def __repr__(self) -> str:
-        return f"Portfolio({self.id}, {len(self._positions)} positions, ${float(self.calculate_total_value()):.2f})"
+        return f"Portfolio({self.id}, {len(self._positions)} positions, ${self.calculate_total_value():.2f})"
 
@@ -13,11 +13,7 @@ class RiskProfile:
     @property
     def max_position_size_pct(self) -> float:
         """Maximum percentage of portfolio per position"""
-        return {
-            "Risk-On": 0.50,      # 50% max
-            "Balanced": 0.33,     # 33% max
-            "Risk-Off": 0.25      # 25% max
-        }[self.value]
+        return _MAX_POSITION_SIZE_PCT[self.value]
     
     @property
     def display_name(self) -> str:
@@ -27,3 +23,9 @@ class RiskProfile:
     def __str__(self) -> str:
         return self.value
 
+
+_MAX_POSITION_SIZE_PCT = {
+    "Risk-On": 0.50,      # 50% max
+    "Balanced": 0.33,     # 33% max
+    "Risk-Off": 0.25      # 25% max
+}
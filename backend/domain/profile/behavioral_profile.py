@@ -17,20 +17,24 @@ class BehavioralProfile(str, Enum):
     @property
     def description(self) -> str:
         """Profile description"""
-        return {
-            "Rational": "Data-driven decision maker who resists emotional pressure",
-            "Emotional": "Influenced by fear and FOMO, needs more data discipline",
-            "Conservative": "Risk-averse with careful position management",
-            "Balanced": "Balanced approach between emotion and analysis"
-        }[self.value]
+        return _DESCRIPTIONS[self.value]
     
     @property
     def emoji(self) -> str:
         """Visual emoji"""
-        return {
-            "Rational": "🧠",
-            "Emotional": "😰",
-            "Conservative": "🛡️",
-            "Balanced": "⚖️"
-        }[self.value]
+        return _EMOJIS[self.value]
 
+
+_DESCRIPTIONS = {
+    "Rational": "Data-driven decision maker who resists emotional pressure",
+    "Emotional": "Influenced by fear and FOMO, needs more data discipline",
+    "Conservative": "Risk-averse with careful position management",
+    "Balanced": "Balanced approach between emotion and analysis"
+}
+
+_EMOJIS = {
+    "Rational": "🧠",
+    "Emotional": "😰",
+    "Conservative": "🛡️",
+    "Balanced": "⚖️"
+}
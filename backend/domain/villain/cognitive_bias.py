@@ -17,20 +17,24 @@ class CognitiveBias(str, Enum):
     @property
     def description(self) -> str:
         """Description of the bias"""
-        return {
-            "Fear Appeal": "Creating panic and urgency to sell",
-            "Overconfidence": "Promoting guaranteed gains and FOMO",
-            "Authority Lure": "Appealing to expert opinion",
-            "Recency Bias": "Overweighting recent price action"
-        }[self.value]
+        return _DESCRIPTIONS[self.value]
     
     @property
     def emoji(self) -> str:
         """Visual emoji"""
-        return {
-            "Fear Appeal": "😱",
-            "Overconfidence": "🚀",
-            "Authority Lure": "🎓",
-            "Recency Bias": "📈"
-        }[self.value]
+        return _EMOJIS[self.value]
 
+
+_DESCRIPTIONS = {
+    "Fear Appeal": "Creating panic and urgency to sell",
+    "Overconfidence": "Promoting guaranteed gains and FOMO",
+    "Authority Lure": "Appealing to expert opinion",
+    "Recency Bias": "Overweighting recent price action"
+}
+
+_EMOJIS = {
+    "Fear Appeal": "😱",
+    "Overconfidence": "🚀",
+    "Authority Lure": "🎓",
+    "Recency Bias": "📈"
+}
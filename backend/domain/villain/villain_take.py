@@ -3,6 +3,16 @@
 from dataclasses import dataclass
 from .cognitive_bias import CognitiveBias
 
+# Stance / consensus direction: +1 bullish, -1 bearish, 0 neutral
+_STANCE_SIGN = {"Bullish": 1, "Bearish": -1}
+_CONSENSUS_SIGN = {
+    "Two-thirds Bull": 1,
+    "Majority Bull": 1,
+    "Two-thirds Bear": -1,
+    "Majority Bear": -1,
+    "Mixed": 0
+}
+
 
 @dataclass
 class VillainTake:
@@ -16,11 +26,16 @@ class VillainTake:
         if len(self.text) < 20:
             raise ValueError("Villain take must be at least 20 characters")
         
-        if self.stance not in ["Bullish", "Bearish"]:
+        if self.stance not in _STANCE_SIGN:
             raise ValueError("Stance must be 'Bullish' or 'Bearish'")
     
     def is_contrarian_to_consensus(self, consensus_value: str) -> bool:
         """Check if Villain contradicts news consensus"""
+        consensus_sign = _CONSENSUS_SIGN.get(consensus_value)
+        if consensus_sign is not None:
+            return consensus_sign * _STANCE_SIGN[self.stance] < 0
+        
+        # Unrecognized consensus label: fall back to matching its direction
         if "Bull" in consensus_value and self.stance == "Bearish":
             return True
         if "Bear" in consensus_value and self.stance == "Bullish":
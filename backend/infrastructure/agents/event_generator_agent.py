@@ -1,14 +1,55 @@
 """Event Generator Agent - Creates market event scenarios"""
 
-import os
-import json
 import random
+from functools import lru_cache
+from itertools import accumulate
+from typing import Tuple
 from langchain_google_genai import ChatGoogleGenerativeAI
 from config import GEMINI_MODEL, TEMPERATURE_EVENT_GENERATOR
 
 # Initialize LLM (only used for event description generation)
 llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, temperature=TEMPERATURE_EVENT_GENERATOR)
 
+EVENT_TYPES = (
+    "EARNINGS_SURPRISE", "REGULATORY_NEWS", "ANALYST_ACTION",
+    "VOLATILITY_SPIKE", "PRODUCT_NEWS", "MACRO_EVENT"
+)
+
+# Event type -> horizon (trading days)
+EVENT_HORIZONS = {
+    "EARNINGS_SURPRISE": 3,
+    "REGULATORY_NEWS": 5,
+    "ANALYST_ACTION": 3,
+    "VOLATILITY_SPIKE": 2,
+    "PRODUCT_NEWS": 4,
+    "MACRO_EVENT": 5
+}
+
+# Event type -> description prompt ({ticker} is filled in per event)
+EVENT_TEMPLATES = {
+    "EARNINGS_SURPRISE": "Create a realistic earnings surprise event for {ticker}. Include specific numbers (EPS beat/miss %), pre-market reaction, and key details like revenue and guidance.",
+    "REGULATORY_NEWS": "Create a regulatory news event for {ticker}. Include government action, fine amounts, investigation details, or approval news.",
+    "ANALYST_ACTION": "Create an analyst upgrade or downgrade for {ticker}. Include the firm name, old/new rating, price target, and brief rationale.",
+    "VOLATILITY_SPIKE": "Create a sudden volatility event for {ticker}. Include breaking news, percentage move, volume surge.",
+    "PRODUCT_NEWS": "Create a product-related event for {ticker}. Include launch, recall, breakthrough, or partnership details.",
+    "MACRO_EVENT": "Create a macro event affecting {ticker}'s sector. Include Fed decision, economic data, or policy change."
+}
+DEFAULT_EVENT_TEMPLATE = "Create a market event for {ticker}"
+
+
+@lru_cache(maxsize=1024)
+def _ticker_distribution(allocations: Tuple[Tuple[str, float], ...]) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+    """
+    Helper: Tickers and cumulative allocation weights for a portfolio.
+    
+    Cached per allocation set, since a game draws from the same portfolio
+    every round. Unnormalized cumulative weights pick the same distribution
+    as normalized ones.
+    """
+    tickers = tuple(ticker for ticker, _ in allocations)
+    cum_weights = tuple(accumulate(weight for _, weight in allocations))
+    return tickers, cum_weights
+
 
 async def event_generator_agent(state: dict) -> dict:
     """
@@ -19,39 +60,20 @@ async def event_generator_agent(state: dict) -> dict:
     portfolio = state.get("portfolio", {})
     
     # Step 1: Select ticker (no API call - pure logic)
-    tickers = list(portfolio.keys())
-    weights = [portfolio[t] for t in tickers]
-    total = sum(weights)
-    normalized_weights = [w/total for w in weights]
-    selected_ticker = random.choices(tickers, weights=normalized_weights, k=1)[0]
+    tickers, cum_weights = _ticker_distribution(tuple(portfolio.items()))
+    selected_ticker = random.choices(tickers, cum_weights=cum_weights, k=1)[0]
     
     # Step 2: Determine event type (no API call - pure logic)
-    event_types = ["EARNINGS_SURPRISE", "REGULATORY_NEWS", "ANALYST_ACTION", 
-                   "VOLATILITY_SPIKE", "PRODUCT_NEWS", "MACRO_EVENT"]
-    event_type = random.choice(event_types)
+    event_type = random.choice(EVENT_TYPES)
     
     # Step 3: Set horizon (no API call - pure logic)
-    horizons = {
-        "EARNINGS_SURPRISE": 3,
-        "REGULATORY_NEWS": 5,
-        "ANALYST_ACTION": 3,
-        "VOLATILITY_SPIKE": 2,
-        "PRODUCT_NEWS": 4,
-        "MACRO_EVENT": 5
-    }
-    horizon = horizons.get(event_type, 3)
+    horizon = EVENT_HORIZONS.get(event_type, 3)
     
     # Step 4: Generate description (ONLY API CALL)
-    templates = {
-        "EARNINGS_SURPRISE": f"Create a realistic earnings surprise event for {selected_ticker}. Include specific numbers (EPS beat/miss %), pre-market reaction, and key details like revenue and guidance.",
-        "REGULATORY_NEWS": f"Create a regulatory news event for {selected_ticker}. Include government action, fine amounts, investigation details, or approval news.",
-        "ANALYST_ACTION": f"Create an analyst upgrade or downgrade for {selected_ticker}. Include the firm name, old/new rating, price target, and brief rationale.",
-        "VOLATILITY_SPIKE": f"Create a sudden volatility event for {selected_ticker}. Include breaking news, percentage move, volume surge.",
-        "PRODUCT_NEWS": f"Create a product-related event for {selected_ticker}. Include launch, recall, breakthrough, or partnership details.",
-        "MACRO_EVENT": f"Create a macro event affecting {selected_ticker}'s sector. Include Fed decision, economic data, or policy change."
-    }
+    # Only the selected template is formatted
+    event_prompt = EVENT_TEMPLATES.get(event_type, DEFAULT_EVENT_TEMPLATE).format(ticker=selected_ticker)
     
-    prompt = f"""{templates.get(event_type, f'Create a market event for {selected_ticker}')}.
+    prompt = f"""{event_prompt}.
 
 Make it:
 - Specific with numbers (percentages, dollar amounts, price targets)
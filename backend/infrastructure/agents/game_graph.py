@@ -1,14 +1,13 @@
 """Multi-Agent Game Graph - Orchestrates all 6 agents"""
 
+import asyncio
 from typing import TypedDict, Annotated, Literal
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage, HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from config import GEMINI_MODEL, TEMPERATURE_SUPERVISOR
+from infrastructure.clients import get_supabase_client, get_tavily_client
 
 from .event_generator_agent import event_generator_agent
-from .portfolio_agent import portfolio_agent
 from .news_agent import news_agent
 from .price_agent import price_agent
 from .villain_agent import villain_agent
@@ -72,87 +71,104 @@ class GameState(TypedDict):
     task: str  # round_start, decision_submitted, round_end, game_end
 
 
-def create_supervisor_node(llm: ChatGoogleGenerativeAI):
+def create_supervisor_node():
     """
     Create supervisor node that routes to appropriate agents.
     
     The supervisor orchestrates the game flow by routing to agents in sequence.
     """
-    def supervisor_node(state: GameState) -> GameState:
+    def supervisor_node(state: GameState) -> dict:
         """
         Route to next agent based on task and current state.
         
-        Game flow:
-        1. round_start -> event_generator
-        2. event_generator -> portfolio, news, price, villain, insight (parallel)
-        3. All agents complete -> END (wait for player decision)
-        4. decision_submitted -> price (calculate outcome)
-        5. price complete -> insight (track behavior)
-        6. insight complete -> END
-        """
-        task = state.get("task", "round_start")
-        
-        # Round start: Generate event
-        if task == "round_start":
-            return {**state, "next_agent": "event_generator"}
+        Returns only the routing keys; LangGraph merges them into the state.
         
-        # Event generated: Fetch all round data
-        elif task == "event_generated":
-            # In a real implementation, we'd run these in parallel
-            # For MVP, we'll run sequentially: portfolio -> news -> price -> villain -> insight
-            if not state.get("price_snapshot"):
-                return {**state, "next_agent": "price", "task": "fetching_data"}
-            elif not state.get("headlines"):
-                return {**state, "next_agent": "news", "task": "fetching_data"}
-            elif not state.get("villain_hot_take"):
-                return {**state, "next_agent": "villain", "task": "fetching_data"}
-            elif not state.get("neutral_tip"):
-                return {**state, "next_agent": "insight", "task": "fetching_data"}
-            else:
-                return {**state, "next_agent": "END", "task": "round_complete"}
-        
-        # Fetching data: Continue with next agent
-        elif task == "fetching_data":
-            # Continue with the same logic as event_generated
-            if not state.get("price_snapshot"):
-                return {**state, "next_agent": "price", "task": "fetching_data"}
-            elif not state.get("headlines"):
-                return {**state, "next_agent": "news", "task": "fetching_data"}
-            elif not state.get("villain_hot_take"):
-                return {**state, "next_agent": "villain", "task": "fetching_data"}
-            elif not state.get("neutral_tip"):
-                return {**state, "next_agent": "insight", "task": "fetching_data"}
-            else:
-                return {**state, "next_agent": "END", "task": "round_complete"}
+        Decision flow (round start runs directly via run_round):
+        1. decision_submitted -> price (calculate outcome)
+        2. outcome_calculated -> insight (track behavior)
+        3. insight complete -> END
+        """
+        task = state.get("task")
         
         # Player made decision: Calculate outcome
-        elif task == "decision_submitted":
-            return {**state, "next_agent": "price"}
+        if task == "decision_submitted":
+            return {"next_agent": "price"}
         
         # Outcome calculated: Track behavior
         elif task == "outcome_calculated":
-            return {**state, "next_agent": "insight"}
+            return {"next_agent": "insight"}
         
         # Round complete
         elif task == "round_complete":
-            return {**state, "next_agent": "END"}
+            return {"next_agent": "END"}
         
         # Game complete
         elif task == "game_complete":
-            return {**state, "next_agent": "END"}
+            return {"next_agent": "END"}
         
         # Default: end
         else:
-            return {**state, "next_agent": "END"}
+            return {"next_agent": "END"}
     
     return supervisor_node
 
 
-# Create supervisor LLM
-supervisor_llm = ChatGoogleGenerativeAI(model=GEMINI_MODEL, temperature=TEMPERATURE_SUPERVISOR)
+async def fetch_round_data(state: dict) -> dict:
+    """
+    Fetch all round data for the generated event, running independent agents concurrently.
+    
+    Dependencies:
+    1. price (needs ticker) and villain (needs event description) run in parallel
+    2. news (contradiction vs villain stance) and insight (needs price pattern) run in parallel
+    """
+    price_state, villain_state = await asyncio.gather(price_agent(state), villain_agent(state))
+    state = {**state, **_changes(state, price_state), **_changes(state, villain_state)}
+    
+    news_state, insight_state = await asyncio.gather(news_agent(state), insight_agent(state))
+    return {**state, **_changes(state, news_state), **_changes(state, insight_state)}
+
+
+def _changes(before: dict, after: dict) -> dict:
+    """Helper: Keys an agent added or replaced in its returned state"""
+    return {k: v for k, v in after.items() if k not in before or before[k] is not v}
 
-# Create supervisor node
-supervisor = create_supervisor_node(supervisor_llm)
+
+# State key -> agent that produces it, in the order gaps are filled
+ROUND_DATA_FALLBACKS = (
+    ("price_snapshot", price_agent),
+    ("headlines", news_agent),
+    ("villain_hot_take", villain_agent),
+    ("neutral_tip", insight_agent)
+)
+
+
+async def run_round(state: dict) -> dict:
+    """
+    Run the round-start flow as a plain async pipeline.
+    
+    Round start always takes the same path (event_generator -> round data ->
+    gap filling), so it runs directly instead of through the graph's
+    supervisor dispatch and state merging.
+    
+    Args:
+        state: Initial round state (portfolio, round number, ...)
+        
+    Returns:
+        Final round state
+    """
+    state = await event_generator_agent(state)
+    state = await fetch_round_data(state)
+    
+    # Fill in anything the parallel fetch did not produce
+    for key, agent in ROUND_DATA_FALLBACKS:
+        if not state.get(key):
+            state = await agent(state)
+    
+    return {**state, "task": "round_complete"}
+
+
+# Create supervisor node (deterministic routing, no LLM)
+supervisor = create_supervisor_node()
 
 
 def create_game_graph():
@@ -164,13 +180,9 @@ def create_game_graph():
     """
     workflow = StateGraph(GameState)
     
-    # Add nodes
+    # Add nodes (decision flow only; round start runs via run_round)
     workflow.add_node("supervisor", supervisor)
-    workflow.add_node("event_generator", event_generator_agent)
-    workflow.add_node("portfolio", portfolio_agent)
-    workflow.add_node("news", news_agent)
     workflow.add_node("price", price_agent)
-    workflow.add_node("villain", villain_agent)
     workflow.add_node("insight", insight_agent)
     
     # Set entry point
@@ -181,18 +193,14 @@ def create_game_graph():
         "supervisor",
         lambda state: state.get("next_agent", "END"),
         {
-            "event_generator": "event_generator",
-            "portfolio": "portfolio",
-            "news": "news",
             "price": "price",
-            "villain": "villain",
             "insight": "insight",
             "END": END
         }
     )
     
     # All agents return to supervisor
-    for agent_name in ["event_generator", "portfolio", "news", "price", "villain", "insight"]:
+    for agent_name in ["price", "insight"]:
         workflow.add_edge(agent_name, "supervisor")
     
     return workflow.compile()
@@ -202,7 +210,29 @@ def create_game_graph():
 game_graph = create_game_graph()
 
 
-# Helper function to invoke graph for round start
+def warm_up() -> None:
+    """
+    Warm up the round agents at process start.
+    
+    Builds everything the first round would otherwise initialize lazily:
+    the agents' Gemini clients (module-level, created when this module is
+    imported), the shared Supabase and Tavily clients, and the data-source
+    modules the agents import on first use.
+    """
+    import yfinance  # noqa: F401 - imported lazily by price_agent
+    try:
+        import tavily  # noqa: F401 - imported lazily by news_agent
+    except ImportError:
+        pass
+    
+    get_tavily_client()
+    try:
+        get_supabase_client()
+    except ImportError:
+        pass  # supabase not installed: handlers use in-memory storage
+
+
+# Helper function to run round start
 async def start_round(
     game_id: str,
     portfolio_id: str,
@@ -236,7 +266,7 @@ async def start_round(
         "next_agent": "supervisor"
     }
     
-    result = await game_graph.ainvoke(initial_state)
+    result = await run_round(initial_state)
     
     return {
         "event": {
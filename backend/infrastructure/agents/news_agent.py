@@ -1,7 +1,7 @@
 """News Agent - Fetches and analyzes news headlines"""
 
-import os
-import json
+import asyncio
+from infrastructure.clients import get_tavily_client
 
 
 async def news_agent(state: dict) -> dict:
@@ -14,11 +14,10 @@ async def news_agent(state: dict) -> dict:
     
     # Fetch headlines (Tavily or mock data - no Gemini)
     try:
-        from tavily import TavilyClient
-        tavily = TavilyClient(api_key=os.getenv("TAVILY_API_KEY", ""))
-        if os.getenv("TAVILY_API_KEY"):
+        tavily = get_tavily_client()
+        if tavily:
             query = f"{ticker} stock news"
-            results = tavily.search(query, max_results=3, days=3)
+            results = await asyncio.to_thread(tavily.search, query, max_results=3, days=3)
             headlines = [
                 {
                     "title": r.get("title", ""),
@@ -1,5 +1,6 @@
 """Price Agent - Handles price data and historical outcome replay"""
 
+import asyncio
 import os
 from infrastructure.yfinance_adapter.price_fetcher import get_price_snapshot as fetch_price, detect_price_pattern
 
@@ -19,7 +20,7 @@ async def price_agent(state: dict) -> dict:
         # Detect price pattern
         import yfinance as yf
         stock = yf.Ticker(ticker)
-        hist = stock.history(period="5d")
+        hist = await asyncio.to_thread(stock.history, period="5d")
         pattern = detect_price_pattern(hist)
         
         # Update state
@@ -3,6 +3,7 @@
 import os
 from langchain.tools import tool
 import json
+from collections import Counter
 from typing import List, Dict
 import google.generativeai as genai
 from config import GEMINI_MODEL
@@ -71,18 +72,18 @@ Generate tip:"""
 
 
 @tool
-async def classify_profile(metrics: str) -> str:
+async def classify_profile(metrics: Dict) -> Dict:
     """
     Classify behavioral profile using rule-based logic.
     
     Args:
-        metrics: JSON string with behavior metrics
+        metrics: Dict with behavior metrics
         
     Returns:
         Profile classification (Rational, Emotional, Conservative, Balanced)
     """
     try:
-        m = json.loads(metrics)
+        m = metrics
         
         # Rule-based classification (transparent, explainable)
         rational_score = 0
@@ -127,35 +128,35 @@ async def classify_profile(metrics: str) -> str:
         else:
             profile = "Balanced"
         
-        return json.dumps({
+        return {
             "profile": profile,
             "rational_score": rational_score,
             "emotional_score": emotional_score,
             "conservative_score": conservative_score,
             "metrics_used": m
-        })
+        }
         
     except Exception as e:
-        return json.dumps({
+        return {
             "profile": "Balanced",
             "error": str(e)
-        })
+        }
 
 
 @tool
-async def generate_coaching(decision_logs: str, profile: str) -> str:
+async def generate_coaching(decision_logs: List[Dict], profile: str) -> Dict:
     """
     Generate personalized coaching tips using Gemini.
     
     Args:
-        decision_logs: JSON string with all decision logs
+        decision_logs: List of all decision logs
         profile: Behavioral profile (Rational, Emotional, Conservative)
         
     Returns:
-        JSON array of 2-4 coaching tips
+        Dict with 2-4 coaching tips
     """
     try:
-        logs = json.loads(decision_logs)
+        logs = decision_logs
         
         model = genai.GenerativeModel(GEMINI_MODEL)
         
@@ -218,11 +219,11 @@ Generate coaching tips now:"""
             print(f"Response text: {response.text}")
             raise parse_error
         
-        return json.dumps({
+        return {
             "profile": profile,
             "coaching": tips,
             "success": True
-        })
+        }
         
     except Exception as e:
         print(f"Error in generate_coaching: {e}")
@@ -250,68 +251,35 @@ Generate coaching tips now:"""
             ]
         }
         
-        return json.dumps({
+        return {
             "profile": profile,
             "coaching": fallback_coaching.get(profile, fallback_coaching["Balanced"]),
             "success": False,
             "error": str(e)
-        })
+        }
 
 
 @tool
-async def aggregate_behavior(decision_logs: str) -> str:
+async def aggregate_behavior(decision_logs: List[Dict]) -> Dict:
     """
     Aggregate decision logs into behavioral metrics.
     
     Args:
-        decision_logs: JSON array of all decision logs
+        decision_logs: List of all decision logs
         
     Returns:
-        JSON with aggregated metrics
+        Dict with aggregated metrics
     """
     try:
-        logs = json.loads(decision_logs)
+        logs = decision_logs
         
         if not logs:
-            return json.dumps({"error": "No decision logs provided"})
-        
-        total_rounds = len(logs)
+            return {"error": "No decision logs provided"}
         
-        # Calculate metrics
-        data_tab_opened = sum(1 for log in logs if log.get('opened_data_tab', False))
-        data_tab_usage = data_tab_opened / total_rounds
-        
-        # Consensus alignment
-        consensus_aligned = sum(1 for log in logs if _aligns_with_consensus(log))
-        consensus_alignment = consensus_aligned / total_rounds
-        
-        # Villain metrics
-        followed_villain_high_contradiction = sum(
-            1 for log in logs 
-            if log.get('contradiction_score', 0) > 0.7 and _followed_villain(log)
-        )
-        
-        # Behavior flags
-        panic_sells = sum(1 for log in logs if 'panic_sell' in log.get('behavior_flags', []))
-        chased_spikes = sum(1 for log in logs if 'chased_spike' in log.get('behavior_flags', []))
-        
-        # Performance
-        total_pl = sum(log.get('pl_dollars', 0) for log in logs)
-        beat_villain = total_pl > 0  # Simplified
-        
-        return json.dumps({
-            "total_rounds": total_rounds,
-            "data_tab_usage": round(data_tab_usage, 2),
-            "consensus_alignment": round(consensus_alignment, 2),
-            "followed_villain_high_contradiction": followed_villain_high_contradiction,
-            "panic_sells": panic_sells,
-            "chased_spikes": chased_spikes,
-            "total_pl": round(total_pl, 2),
-            "beat_villain": beat_villain
-        })
+        return _aggregate_behavior_local(logs)
         
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"error": str(e)}
 
 
 @tool
@@ -359,6 +327,37 @@ async def identify_patterns(decision_log: str) -> str:
         return json.dumps({"error": str(e)})
 
 
+def _aggregate_behavior_local(logs: List[Dict]) -> Dict:
+    """Helper: Compute behavioral metrics in a single pass over the decision logs"""
+    total_rounds = len(logs)
+    data_tab_opened = 0
+    consensus_aligned = 0
+    followed_villain_high_contradiction = 0
+    flag_counts = Counter()
+    total_pl = 0
+    
+    for log in logs:
+        if log.get('opened_data_tab', False):
+            data_tab_opened += 1
+        if _aligns_with_consensus(log):
+            consensus_aligned += 1
+        if log.get('contradiction_score', 0) > 0.7 and _followed_villain(log):
+            followed_villain_high_contradiction += 1
+        flag_counts.update(set(log.get('behavior_flags', [])))
+        total_pl += log.get('pl_dollars', 0)
+    
+    return {
+        "total_rounds": total_rounds,
+        "data_tab_usage": round(data_tab_opened / total_rounds, 2),
+        "consensus_alignment": round(consensus_aligned / total_rounds, 2),
+        "followed_villain_high_contradiction": followed_villain_high_contradiction,
+        "panic_sells": flag_counts['panic_sell'],
+        "chased_spikes": flag_counts['chased_spike'],
+        "total_pl": round(total_pl, 2),
+        "beat_villain": total_pl > 0  # Simplified
+    }
+
+
 def _summarize_decision_patterns(logs: List[Dict]) -> str:
     """Helper: Summarize key patterns from decision logs"""
     if not logs:
@@ -0,0 +1,111 @@
+"""
+Shared external service clients
+
+One instance per process, created on first use and injected into handlers
+and agents so connections (and TLS sessions) are reused across requests.
+"""
+
+import asyncio
+import os
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Keep-alive pool for the Supabase REST client (shared by all handler threads)
+SUPABASE_MAX_CONNECTIONS = 100
+SUPABASE_MAX_KEEPALIVE = 50
+SUPABASE_KEEPALIVE_EXPIRY = 30.0  # seconds
+SUPABASE_TIMEOUT = 120.0  # seconds, postgrest-py's default
+SUPABASE_CONNECT_RETRIES = 2  # retries when opening a new connection fails
+
+
+@lru_cache(maxsize=None)
+def get_supabase_client():
+    """
+    Get the shared Supabase client.
+
+    Returns:
+        Supabase client, or None if SUPABASE_URL / SUPABASE_ANON_KEY are not set
+
+    Raises:
+        ImportError: supabase package not installed
+    """
+    from supabase import create_client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_ANON_KEY")
+    if not (url and key):
+        return None
+
+    options = _supabase_options()
+    if options is None:
+        return create_client(url, key)
+    return create_client(url, key, options=options)
+
+
+def _supabase_options():
+    """
+    Helper: Client options with a pooled, keep-alive HTTP client.
+
+    Uses HTTP/2 when the h2 package is installed so concurrent queries
+    multiplex over one connection, and retries transient connect errors
+    (DNS/TCP/TLS) instead of failing the query.
+
+    Returns:
+        ClientOptions, or None if this supabase-py version can't take an httpx client
+    """
+    import httpx
+    from supabase import ClientOptions
+
+    transport = httpx.HTTPTransport(
+        http2=find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+        ),
+        retries=SUPABASE_CONNECT_RETRIES
+    )
+    http_client = httpx.Client(transport=transport, timeout=SUPABASE_TIMEOUT)
+
+    try:
+        return ClientOptions(httpx_client=http_client)
+    except TypeError:
+        # Older supabase-py without httpx_client support
+        http_client.close()
+        return None
+
+
+async def run_query(query):
+    """
+    Execute a supabase-py query without blocking the event loop.
+
+    supabase-py's sync client does blocking HTTP in .execute(); this runs it
+    in the default thread pool so concurrent requests overlap their DB I/O.
+
+    Args:
+        query: Query or RPC builder (anything with .execute())
+
+    Returns:
+        The query's APIResponse
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+@lru_cache(maxsize=None)
+def get_tavily_client():
+    """
+    Get the shared Tavily client.
+
+    Returns:
+        TavilyClient, or None if TAVILY_API_KEY is not set or tavily is not installed
+    """
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        from tavily import TavilyClient
+    except ImportError:
+        return None
+
+    return TavilyClient(api_key=api_key)
@@ -0,0 +1,28 @@
+"""Time-ordered identifiers for database rows"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7 (RFC 9562): 48-bit Unix millisecond timestamp + random bits.
+    
+    Values sort by creation time, so inserts keyed on them stay append-only
+    in B-tree indexes instead of landing on random pages like uuid4.
+    
+    Returns:
+        UUID with version 7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= int.from_bytes(os.urandom(10), "big") & ((1 << 80) - 1)
+    
+    # Set version (7) and RFC 4122 variant bits
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    
+    return uuid.UUID(int=value)
@@ -0,0 +1,53 @@
+"""
+Non-blocking Logging Setup
+
+Routes log records through a queue so handlers write to stdout on a
+background thread instead of inside the request / event-loop path.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> logging.handlers.QueueListener:
+    """
+    Setup queue-based logging for the application.
+
+    Call this once at application startup. Repeated calls return the
+    already-running listener.
+
+    Args:
+        level: Root log level (defaults to LOG_LEVEL env var, then INFO)
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO"))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    return _listener
@@ -5,11 +5,14 @@ Tracks all agent calls, tool usage, and LLM interactions.
 """
 
 import os
-from typing import Any, Dict, Optional
+import logging
+from typing import Any, Dict, Optional, Set
 import opik
 from functools import wraps
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 
 def setup_opik():
     """
@@ -147,6 +150,40 @@ def log_game_event(event_type: str, data: Dict[str, Any]):
         print(f"Failed to log event: {str(e)}")
 
 
+# Pending background log futures (see log_game_event_background)
+_background_logs: Set["asyncio.Future"] = set()
+
+
+def log_game_event_background(event_type: str, data: Dict[str, Any]):
+    """
+    Log custom game events to Opik without blocking the caller.
+    
+    Runs log_game_event in the default thread pool when called from an
+    event loop, so Opik I/O stays off the request path. Falls back to
+    a synchronous call when no loop is running.
+    
+    Usage:
+        log_game_event_background("game_started", {"game_id": game_id})
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        log_game_event(event_type, data)
+        return
+    
+    # Hold a reference until done so the pending future isn't garbage-collected
+    future = loop.run_in_executor(None, log_game_event, event_type, data)
+    _background_logs.add(future)
+    future.add_done_callback(_on_background_log_done)
+
+
+def _on_background_log_done(future: "asyncio.Future"):
+    """Helper: Release a finished background log and report its failure, if any"""
+    _background_logs.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Failed to log event: %s", future.exception())
+
+
 def log_llm_call(
     model: str,
     prompt: str,
@@ -0,0 +1,112 @@
+"""
+Write-behind buffer for game_rounds inserts
+
+Round outcomes are queued and flushed as multi-row inserts, so concurrent
+players share one Supabase round-trip instead of paying one each.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from infrastructure.clients import run_query
+
+logger = logging.getLogger(__name__)
+
+# Postgres SQLSTATE raised by PostgREST when session_id has no game_sessions row
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+class AsyncRoundOutcomeWriter:
+    """
+    Batches game_rounds rows in the background.
+
+    Rows are collected for up to max_delay seconds or max_batch rows,
+    whichever comes first, then written with a single insert.
+    """
+
+    def __init__(self, supabase_client, max_batch: int = 100, max_delay: float = 0.05):
+        self.supabase = supabase_client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the background flush task (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, row: Dict) -> None:
+        """
+        Queue a game_rounds row and return immediately.
+
+        Args:
+            row: Column values for one game_rounds row
+        """
+        self.start()
+        self._queue.put_nowait(row)
+
+    async def flush(self) -> None:
+        """Wait until every queued row has been written"""
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Flush outstanding rows and stop the background task"""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Helper: Drain the queue in batches forever"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, rows: List[Dict]) -> None:
+        """Helper: Insert a batch, retrying row by row if the batch is rejected"""
+        # returning="minimal": inserted rows are never read back, so skip the response body
+        try:
+            await run_query(self.supabase.table("game_rounds").insert(rows, returning="minimal"))
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                self._report_failure(rows[0], e)
+                return
+
+        # One bad row (e.g. unknown session) fails the whole statement;
+        # write the rest individually so valid outcomes are kept
+        for row in rows:
+            try:
+                await run_query(self.supabase.table("game_rounds").insert(row, returning="minimal"))
+            except Exception as e:
+                self._report_failure(row, e)
+
+    @staticmethod
+    def _report_failure(row: Dict, error: Exception) -> None:
+        """Helper: Log a row that could not be written"""
+        if getattr(error, "code", None) == FOREIGN_KEY_VIOLATION:
+            logger.warning("Game session %s not found, skipping round outcome save", row.get("session_id"))
+        else:
+            logger.warning("Failed to save round outcome for game %s: %s", row.get("session_id"), error)
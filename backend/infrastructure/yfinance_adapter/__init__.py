@@ -1,10 +1,11 @@
 """yfinance adapter for price data and historical windows"""
 
-from .price_fetcher import get_current_price, get_price_snapshot
+from .price_fetcher import get_current_price, get_current_prices, get_price_snapshot
 from .historical_sampler import sample_historical_window, apply_decision_to_path
 
 __all__ = [
     "get_current_price",
+    "get_current_prices",
     "get_price_snapshot", 
     "sample_historical_window",
     "apply_decision_to_path"
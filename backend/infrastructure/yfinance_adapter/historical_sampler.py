@@ -6,6 +6,20 @@ import random
 from typing import Dict, Any
 from decimal import Decimal
 
+# Outcome explanation per decision, filled from the numbers computed in apply_decision_to_path
+_EXPLANATION_TEMPLATES = {
+    "SELL_ALL": "Exited entire ${position_size:,.0f} position at ${day0_price:.2f}. No P/L since exit at current price.",
+    "SELL_HALF": (
+        "Sold half (${half_size:,.0f}) at ${day0_price:.2f}. Remaining half rode from ${day0_price:.2f} "
+        "to ${day_h_price:.2f} ({day_h_return_pct:.2f}%). P/L on remaining half: {pl_percent_pct:.2f}%."
+    ),
+    "HOLD": (
+        "Held entire ${position_size:,.0f} position. Price moved from ${day0_price:.2f} to ${day_h_price:.2f} "
+        "({day_h_return_pct:.2f}%). Full exposure to price movement."
+    ),
+    "BUY": "Added ${buy_size:,.0f} (10%) to ${position_size:,.0f} position at ${day0_price:.2f}. P/L on additional 10%: {pl_percent_pct:.2f}%.",
+}
+
 
 async def sample_historical_window(
     ticker: str,
@@ -80,49 +94,49 @@ async def apply_decision_to_path(
     Returns:
         Dict with P/L dollars, percent, and explanation
     """
+    if decision not in _EXPLANATION_TEMPLATES:
+        raise ValueError(f"Invalid decision: {decision}")
+    
     day0_price = Decimal(str(historical_case['day0_price']))
     day_h_price = Decimal(str(historical_case['day_h_price']))
     position_size_decimal = Decimal(str(position_size))
+    day_h_return = (day_h_price - day0_price) / day0_price if day0_price else Decimal(0)
+    half_size = position_size_decimal / Decimal(2)
+    buy_size = position_size_decimal * Decimal("0.1")
     
     if decision == "SELL_ALL":
         # Exit entire position at day 0, no further exposure
         # P/L is $0 because we exit at current price (no gain/loss)
         pl_dollars = Decimal(0)
         pl_percent = Decimal(0)
-        explanation = f"Exited entire ${position_size:,.0f} position at ${day0_price:.2f}. No P/L since exit at current price."
         
     elif decision == "SELL_HALF":
         # Exit half at day 0, remaining half rides to day H
         # P/L is only on the remaining half that rides the price change
-        half_size = position_size_decimal / Decimal(2)
-        day_h_return = (day_h_price - day0_price) / day0_price
         pl_dollars = half_size * day_h_return  # P/L only on remaining half
         pl_percent = day_h_return / Decimal(2)  # Weighted by half exposure
         
-        explanation = f"Sold half (${float(half_size):,.0f}) at ${day0_price:.2f}. Remaining half rode from ${day0_price:.2f} to ${day_h_price:.2f} ({float(day_h_return)*100:.2f}%). P/L on remaining half: {float(pl_percent)*100:.2f}%."
-        
     elif decision == "HOLD":
         # Full position rides to day H
         # P/L is the gain/loss from entry price to final price
-        day_h_return = (day_h_price - day0_price) / day0_price
         pl_dollars = position_size_decimal * day_h_return
         pl_percent = day_h_return
         
-        explanation = f"Held entire ${position_size:,.0f} position. Price moved from ${day0_price:.2f} to ${day_h_price:.2f} ({float(day_h_return)*100:.2f}%). Full exposure to price movement."
-        
-    elif decision == "BUY":
-        # Add 10% to position, total position rides to day H
+    else:
+        # BUY: add 10% to position, total position rides to day H
         # P/L is calculated on the additional 10% purchased
-        buy_size = position_size_decimal * Decimal("0.1")
-        total_size = position_size_decimal + buy_size
-        day_h_return = (day_h_price - day0_price) / day0_price
         pl_dollars = buy_size * day_h_return  # P/L only on the additional 10%
         pl_percent = day_h_return * Decimal("0.1")  # Weighted by 10% addition
-        
-        explanation = f"Added ${float(buy_size):,.0f} (10%) to ${position_size:,.0f} position at ${day0_price:.2f}. P/L on additional 10%: {float(pl_percent)*100:.2f}%."
-        
-    else:
-        raise ValueError(f"Invalid decision: {decision}")
+    
+    explanation = _EXPLANATION_TEMPLATES[decision].format_map({
+        "position_size": position_size,
+        "day0_price": day0_price,
+        "day_h_price": day_h_price,
+        "half_size": float(half_size),
+        "buy_size": float(buy_size),
+        "day_h_return_pct": float(day_h_return) * 100,
+        "pl_percent_pct": float(pl_percent) * 100
+    })
     
     return {
         "pl_dollars": float(pl_dollars),
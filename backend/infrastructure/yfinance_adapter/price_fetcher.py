@@ -1,8 +1,18 @@
 """Price fetcher using yfinance"""
 
+import asyncio
+import time
+from collections import OrderedDict
 import yfinance as yf
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+# Latest closes are shared across players for a short window
+PRICE_CACHE_TTL = 60  # seconds
+PRICE_CACHE_SIZE = 5000
+
+# ticker -> (fetched_at, price), oldest first
+_price_cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
 
 
 async def get_current_price(ticker: str) -> float:
@@ -15,13 +25,68 @@ async def get_current_price(ticker: str) -> float:
     Returns:
         Current closing price
     """
-    stock = yf.Ticker(ticker)
-    data = stock.history(period="1d")
+    prices = await get_current_prices([ticker])
     
-    if data.empty:
+    if ticker not in prices:
         raise ValueError(f"No price data available for {ticker}")
     
-    return float(data['Close'].iloc[-1])
+    return prices[ticker]
+
+
+async def get_current_prices(tickers: List[str]) -> Dict[str, float]:
+    """
+    Fetch current prices for several tickers in one request
+    
+    Prices fetched within the last PRICE_CACHE_TTL seconds are served from
+    memory; the rest are downloaded together in a single yfinance call.
+    
+    Args:
+        tickers: Stock ticker symbols
+        
+    Returns:
+        Dict of {ticker: current closing price}; tickers without data are omitted
+    """
+    now = time.monotonic()
+    prices: Dict[str, float] = {}
+    missing: List[str] = []
+    
+    for ticker in dict.fromkeys(tickers):
+        cached = _price_cache.get(ticker)
+        if cached and now - cached[0] < PRICE_CACHE_TTL:
+            prices[ticker] = cached[1]
+        else:
+            missing.append(ticker)
+    
+    if not missing:
+        return prices
+    
+    data = await asyncio.to_thread(
+        yf.download, missing, period="1d", group_by="ticker", threads=True, progress=False
+    )
+    
+    fetched_at = time.monotonic()
+    for ticker in missing:
+        if data.empty:
+            break
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            closes = data[ticker]["Close"].dropna()
+        else:
+            closes = data["Close"].dropna()
+        
+        if closes.empty:
+            continue
+        
+        price = float(closes.iloc[-1])
+        prices[ticker] = price
+        _price_cache[ticker] = (fetched_at, price)
+        _price_cache.move_to_end(ticker)
+    
+    while len(_price_cache) > PRICE_CACHE_SIZE:
+        _price_cache.popitem(last=False)
+    
+    return prices
 
 
 async def get_price_snapshot(ticker: str) -> Dict[str, Any]:
@@ -35,7 +100,7 @@ async def get_price_snapshot(ticker: str) -> Dict[str, Any]:
         Dict with current price, sparkline, high/low
     """
     stock = yf.Ticker(ticker)
-    data = stock.history(period="5d")
+    data = await asyncio.to_thread(stock.history, period="5d")
     
     if data.empty:
         raise ValueError(f"No price data available for {ticker}")
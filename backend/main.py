@@ -12,23 +12,21 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import os
-import json
+import orjson
 
-# Initialize Supabase client
+# Initialize Supabase client (shared by all handlers)
 try:
-    from supabase import create_client, Client
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY")
+    from infrastructure.clients import get_supabase_client
+    supabase = get_supabase_client()
     
-    if SUPABASE_URL and SUPABASE_KEY:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    if supabase is not None:
         SUPABASE_AVAILABLE = True
         print("Supabase client initialized")
     else:
-        supabase = None
         SUPABASE_AVAILABLE = False
         print("WARNING: SUPABASE_URL or SUPABASE_KEY not set. Using in-memory storage.")
 except ImportError:
@@ -38,10 +36,14 @@ except ImportError:
 
 # Import application handlers (these import agents which need API keys)
 from application.portfolio.create_portfolio_handler import CreatePortfolioHandler
-from application.game.start_game_handler import StartGameHandler
+from application.game.start_game_handler import StartGameHandler, PortfolioNotFoundError
 from application.game.start_round_handler import StartRoundHandler
 from application.game.submit_decision_handler import SubmitDecisionHandler
 from application.game.generate_final_report_handler import GenerateFinalReportHandler
+from application.game.round_context import RoundContext
+from infrastructure.clients import run_query
+from infrastructure.round_outcome_writer import AsyncRoundOutcomeWriter
+from infrastructure.logging_config import setup_logging
 
 # Import observability
 try:
@@ -55,13 +57,17 @@ except ImportError:
 app = FastAPI(
     title="Market Mayhem API",
     description="Portfolio-building game with multi-agent AI system",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes responses in C (and handles numpy values from yfinance)
+    default_response_class=ORJSONResponse
 )
 
 # Setup observability on startup
 @app.on_event("startup")
 async def startup_event():
     """Initialize observability on application startup"""
+    setup_logging()
+    
     print("\n" + "="*60)
     print("Market Mayhem API Starting...")
     print("="*60 + "\n")
@@ -76,11 +82,28 @@ async def startup_event():
         else:
             print("\nObservability not enabled (API keys not set)")
     
+    # Warm up the round agents so the first round runs at steady-state latency
+    try:
+        from infrastructure.agents.game_graph import warm_up
+        warm_up()
+        print("Round agents warmed up")
+    except Exception as e:
+        print(f"WARNING: Round agent warm-up failed: {e}")
+    
+    if round_outcome_writer:
+        round_outcome_writer.start()
+    
     print("\n" + "="*60)
     print("API Ready at http://localhost:8000")
     print("Docs at http://localhost:8000/docs")
     print("="*60 + "\n")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered round outcomes so none are lost on shutdown"""
+    if round_outcome_writer:
+        await round_outcome_writer.stop()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -101,9 +124,34 @@ portfolios_store = {}
 # Initialize handlers with Supabase client
 create_portfolio_handler = CreatePortfolioHandler(supabase_client=supabase if SUPABASE_AVAILABLE else None)
 start_game_handler = StartGameHandler(supabase_client=supabase if SUPABASE_AVAILABLE else None)
-start_round_handler = StartRoundHandler()
-submit_decision_handler = SubmitDecisionHandler(supabase_client=supabase if SUPABASE_AVAILABLE else None)
-generate_final_report_handler = GenerateFinalReportHandler(supabase_client=supabase if SUPABASE_AVAILABLE else None)
+# Work started at round start that the decision step consumes (historical windows)
+round_context = RoundContext()
+start_round_handler = StartRoundHandler(round_context=round_context)
+# Batches game_rounds inserts across players; shared so reports see pending outcomes
+round_outcome_writer = AsyncRoundOutcomeWriter(supabase) if SUPABASE_AVAILABLE else None
+submit_decision_handler = SubmitDecisionHandler(
+    supabase_client=supabase if SUPABASE_AVAILABLE else None,
+    round_writer=round_outcome_writer,
+    round_context=round_context
+)
+generate_final_report_handler = GenerateFinalReportHandler(
+    supabase_client=supabase if SUPABASE_AVAILABLE else None,
+    round_writer=round_outcome_writer
+)
+
+
+async def fetch_portfolio_snapshot(portfolio_id: str):
+    """
+    Fetch a portfolio with its positions in one Supabase read.
+    
+    Args:
+        portfolio_id: Portfolio ID
+        
+    Returns:
+        v_portfolio_snapshot row (positions as a list of dicts), or None if not found
+    """
+    response = await run_query(supabase.table("v_portfolio_snapshot").select("*").eq("id", portfolio_id))
+    return response.data[0] if response.data else None
 
 
 # === Request/Response Models ===
@@ -222,21 +270,18 @@ async def start_game(request: StartGameRequest):
     Integrates with Supabase for persistence and Opik for observability.
     """
     try:
-        # Validate portfolio exists (check Supabase first, then in-memory)
-        if SUPABASE_AVAILABLE:
-            # Validate in Supabase
-            portfolio_check = supabase.table("portfolios").select("id").eq("id", request.portfolio_id).execute()
-            if not portfolio_check.data or len(portfolio_check.data) == 0:
-                raise HTTPException(status_code=404, detail=f"Portfolio {request.portfolio_id} not found")
-        else:
-            # Validate in memory
-            if request.portfolio_id not in portfolios_store:
-                raise HTTPException(status_code=404, detail=f"Portfolio {request.portfolio_id} not found")
+        # Validate in-memory portfolios up front (Supabase portfolios are
+        # verified by the handler's start_game RPC in the same round-trip)
+        if not SUPABASE_AVAILABLE and request.portfolio_id not in portfolios_store:
+            raise HTTPException(status_code=404, detail=f"Portfolio {request.portfolio_id} not found")
         
         # Start game (handler saves to Supabase if available)
-        result = await start_game_handler.execute(
-            portfolio_id=request.portfolio_id
-        )
+        try:
+            result = await start_game_handler.execute(
+                portfolio_id=request.portfolio_id
+            )
+        except PortfolioNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         
         game_id = result["game_id"]
         
@@ -244,24 +289,23 @@ async def start_game(request: StartGameRequest):
         # This ensures dynamic portfolio data flows through the entire game
         if SUPABASE_AVAILABLE:
             # Fetch dynamic portfolio data from Supabase
-            portfolio_data = supabase.table("portfolios").select("*").eq("id", request.portfolio_id).execute()
-            positions_data = supabase.table("positions").select("*").eq("portfolio_id", request.portfolio_id).execute()
+            snapshot = await fetch_portfolio_snapshot(request.portfolio_id)
             
-            if not portfolio_data.data or len(portfolio_data.data) == 0:
+            if not snapshot:
                 raise HTTPException(status_code=404, detail=f"Portfolio {request.portfolio_id} not found in database")
             
             # Build dynamic portfolio dict from user's actual positions
             portfolio_dict = {}
-            for pos in positions_data.data:
+            for pos in snapshot["positions"]:
                 portfolio_dict[pos["ticker"]] = float(pos["allocation"])
             
             game_sessions_store[game_id] = {
                 "portfolio_id": request.portfolio_id,
                 "portfolio": portfolio_dict,  # DYNAMIC: User's actual tickers and allocations
-                "portfolio_value": float(portfolio_data.data[0]["total_value"]),
-                "risk_profile": portfolio_data.data[0]["risk_profile"],
+                "portfolio_value": float(snapshot["total_value"]),
+                "risk_profile": snapshot["risk_profile"],
                 "current_round": 0,
-                "initial_portfolio_value": float(portfolio_data.data[0]["total_value"])  # Save initial for final P/L
+                "initial_portfolio_value": float(snapshot["total_value"])  # Save initial for final P/L
             }
         else:
             # Use in-memory data (fallback)
@@ -312,14 +356,13 @@ async def start_round(game_id: str, round_number: int):
         if SUPABASE_AVAILABLE:
             try:
                 portfolio_id = game_session["portfolio_id"]
-                portfolio_data = supabase.table("portfolios").select("*").eq("id", portfolio_id).execute()
-                positions_data = supabase.table("positions").select("*").eq("portfolio_id", portfolio_id).execute()
-                if portfolio_data.data and positions_data.data is not None:
+                snapshot = await fetch_portfolio_snapshot(portfolio_id)
+                if snapshot:
                     # Update cached total value
-                    game_session["portfolio_value"] = float(portfolio_data.data[0]["total_value"])
+                    game_session["portfolio_value"] = float(snapshot["total_value"])
                     # Update cached allocations map
                     game_session["portfolio"] = {
-                        pos["ticker"]: float(pos["allocation"]) for pos in positions_data.data
+                        pos["ticker"]: float(pos["allocation"]) for pos in snapshot["positions"]
                     }
             except Exception as e:
                 print(f"Warning: Failed to refresh portfolio from Supabase: {e}")
@@ -489,24 +532,8 @@ async def get_final_report(game_id: str):
     try:
         # If Supabase is not available, use in-memory values for final summary augmentation
         report = await generate_final_report_handler.execute(game_id=game_id)
-        if not SUPABASE_AVAILABLE and game_id in game_sessions_store:
-            sess = game_sessions_store[game_id]
-            initial_val = float(sess.get("initial_portfolio_value", 1_000_000))
-            final_val = float(sess.get("portfolio_value", initial_val))
-            total_pl = final_val - initial_val
-            total_return_pct = (total_pl / initial_val * 100) if initial_val > 0 else 0.0
-            
-            # Calculate values in millions (divide by 1,000,000)
-            final_value_in_millions = final_val / 1_000_000
-            total_pl_in_millions = total_pl / 1_000_000
-            
-            # Merge into report summary without altering behavioral metrics
-            if "summary" in report:
-                report["summary"].update({
-                    "final_portfolio_value": int(round(final_value_in_millions)),
-                    "total_pl": int(round(total_pl_in_millions)),
-                    "total_return_pct": round(total_return_pct, 2)
-                })
+        if "summary" in report:
+            _apply_in_memory_summary(game_id, report["summary"])
         result = report
         
         return {
@@ -518,6 +545,54 @@ async def get_final_report(game_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/game/{game_id}/report/stream")
+async def stream_final_report(game_id: str):
+    """
+    Stream final game report as server-sent events
+    
+    Each event carries a partial report as soon as it is ready:
+    1. Summary stats + metrics
+    2. Behavioral profile
+    3. Personalized coaching
+    
+    Merging the events gives the same report as GET /game/{game_id}/report.
+    """
+    async def event_source():
+        try:
+            async for chunk in generate_final_report_handler.stream(game_id=game_id):
+                if "summary" in chunk:
+                    _apply_in_memory_summary(game_id, chunk["summary"])
+                yield b"data: " + orjson.dumps(chunk, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+            yield b"event: done\ndata: {}\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+
+def _apply_in_memory_summary(game_id: str, summary: Dict) -> None:
+    """Override report summary values with in-memory session values when Supabase is not available"""
+    if SUPABASE_AVAILABLE or game_id not in game_sessions_store:
+        return
+    
+    sess = game_sessions_store[game_id]
+    initial_val = float(sess.get("initial_portfolio_value", 1_000_000))
+    final_val = float(sess.get("portfolio_value", initial_val))
+    total_pl = final_val - initial_val
+    total_return_pct = (total_pl / initial_val * 100) if initial_val > 0 else 0.0
+    
+    # Calculate values in millions (divide by 1,000,000)
+    final_value_in_millions = final_val / 1_000_000
+    total_pl_in_millions = total_pl / 1_000_000
+    
+    # Merge into report summary without altering behavioral metrics
+    summary.update({
+        "final_portfolio_value": int(round(final_value_in_millions)),
+        "total_pl": int(round(total_pl_in_millions)),
+        "total_return_pct": round(total_return_pct, 2)
+    })
+
+
 @app.get("/game/{game_id}/round/{round_number}/outcome")
 async def get_round_outcome(game_id: str, round_number: int):
     """
@@ -527,7 +602,12 @@ async def get_round_outcome(game_id: str, round_number: int):
     try:
         # Prefer Supabase game_rounds table
         if SUPABASE_AVAILABLE:
-            resp = supabase.table("game_rounds").select("ticker, pl_dollars, pl_percent, round_number").eq("session_id", game_id).eq("round_number", round_number).execute()
+            resp = await run_query(
+                supabase.table("game_rounds")
+                .select("ticker, pl_dollars, pl_percent, round_number")
+                .eq("session_id", game_id)
+                .eq("round_number", round_number)
+            )
             if resp.data and len(resp.data) > 0:
                 row = resp.data[0]
                 return {
@@ -620,14 +700,13 @@ async def game_websocket(websocket: WebSocket, game_id: str):
                 if SUPABASE_AVAILABLE:
                     try:
                         portfolio_id = game_session["portfolio_id"]
-                        portfolio_data = supabase.table("portfolios").select("*").eq("id", portfolio_id).execute()
-                        positions_data = supabase.table("positions").select("*").eq("portfolio_id", portfolio_id).execute()
-                        if portfolio_data.data and positions_data.data is not None:
+                        snapshot = await fetch_portfolio_snapshot(portfolio_id)
+                        if snapshot:
                             # Update cached total value
-                            game_session["portfolio_value"] = float(portfolio_data.data[0]["total_value"])
+                            game_session["portfolio_value"] = float(snapshot["total_value"])
                             # Update cached allocations map
                             game_session["portfolio"] = {
-                                pos["ticker"]: float(pos["allocation"]) for pos in positions_data.data
+                                pos["ticker"]: float(pos["allocation"]) for pos in snapshot["positions"]
                             }
                     except Exception as e:
                         print(f"Warning: Failed to refresh portfolio from Supabase: {e}")
@@ -35,11 +35,15 @@ CREATE TABLE IF NOT EXISTS game_sessions (
     portfolio_id UUID NOT NULL REFERENCES portfolios(id) ON DELETE CASCADE,
     current_round INT DEFAULT 0 CHECK (current_round >= 0 AND current_round <= 3),
     portfolio_value DECIMAL NOT NULL,
+    initial_portfolio_value DECIMAL,
     started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     completed_at TIMESTAMP WITH TIME ZONE,
     final_profile TEXT
 );
 
+-- Added after launch; keeps existing databases in step with the table above
+ALTER TABLE game_sessions ADD COLUMN IF NOT EXISTS initial_portfolio_value DECIMAL;
+
 -- Game rounds table
 CREATE TABLE IF NOT EXISTS game_rounds (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -138,7 +142,9 @@ CREATE TABLE IF NOT EXISTS behavioral_profiles (
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_portfolios_player ON portfolios(player_id);
 CREATE INDEX IF NOT EXISTS idx_portfolios_created ON portfolios(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_positions_portfolio ON positions(portfolio_id);
+-- positions(portfolio_id) lookups use the UNIQUE (portfolio_id, ticker) index;
+-- a separate single-column index would only add write cost
+DROP INDEX IF EXISTS idx_positions_portfolio;
 CREATE INDEX IF NOT EXISTS idx_positions_ticker ON positions(ticker);
 CREATE INDEX IF NOT EXISTS idx_game_portfolio ON game_sessions(portfolio_id);
 CREATE INDEX IF NOT EXISTS idx_games_completed ON game_sessions(completed_at DESC) WHERE completed_at IS NOT NULL;
@@ -189,6 +195,117 @@ CREATE TRIGGER update_positions_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Portfolio snapshot for a game session (final report in one round-trip)
+-- initial_portfolio_value is fixed at game start; older sessions fall back to cash + allocations
+DROP FUNCTION IF EXISTS get_game_portfolio_snapshot(TEXT);
+CREATE OR REPLACE FUNCTION get_game_portfolio_snapshot(session_id TEXT)
+RETURNS TABLE (
+    portfolio_id UUID,
+    total_value DECIMAL,
+    cash DECIMAL,
+    sum_allocations DECIMAL,
+    initial_portfolio_value DECIMAL
+) AS $$
+    SELECT
+        p.id,
+        p.total_value,
+        p.cash,
+        alloc.total,
+        COALESCE(gs.initial_portfolio_value, p.cash + alloc.total)
+    FROM game_sessions gs
+    JOIN portfolios p ON p.id = gs.portfolio_id
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(SUM(pos.allocation), 0) AS total
+        FROM positions pos
+        WHERE pos.portfolio_id = p.id
+    ) alloc
+    WHERE gs.id = get_game_portfolio_snapshot.session_id;
+$$ LANGUAGE sql STABLE;
+
+-- Start a game session from a portfolio (verify + insert in one statement)
+-- Records the initial portfolio value (cash + allocations) so reports never recompute it
+CREATE OR REPLACE FUNCTION start_game(session_id TEXT, portfolio_id UUID)
+RETURNS TABLE (
+    id TEXT,
+    portfolio_value DECIMAL
+) AS $$
+    INSERT INTO game_sessions (id, portfolio_id, current_round, portfolio_value, initial_portfolio_value)
+    SELECT
+        start_game.session_id,
+        p.id,
+        0,
+        p.total_value,
+        p.cash + COALESCE((SELECT SUM(pos.allocation) FROM positions pos WHERE pos.portfolio_id = p.id), 0)
+    FROM portfolios p
+    WHERE p.id = start_game.portfolio_id
+    RETURNING game_sessions.id, game_sessions.portfolio_value;
+$$ LANGUAGE sql VOLATILE;
+
+-- Persist a portfolio after a decision (portfolio row, position upserts and
+-- removal of sold-out positions in one transactional round-trip)
+CREATE OR REPLACE FUNCTION save_portfolio_state(
+    portfolio_id UUID,
+    cash DECIMAL,
+    total_value DECIMAL,
+    positions JSONB
+)
+RETURNS VOID AS $$
+#variable_conflict use_column
+BEGIN
+    UPDATE portfolios
+    SET cash = save_portfolio_state.cash,
+        total_value = save_portfolio_state.total_value,
+        updated_at = NOW()
+    WHERE id = save_portfolio_state.portfolio_id;
+
+    INSERT INTO positions (portfolio_id, ticker, shares, entry_price, current_price, allocation)
+    SELECT save_portfolio_state.portfolio_id, new_pos.ticker, new_pos.shares, new_pos.entry_price, new_pos.current_price, new_pos.allocation
+    FROM jsonb_to_recordset(save_portfolio_state.positions) AS new_pos(
+        ticker TEXT,
+        shares DECIMAL,
+        entry_price DECIMAL,
+        current_price DECIMAL,
+        allocation DECIMAL
+    )
+    ON CONFLICT (portfolio_id, ticker) DO UPDATE
+    SET shares = EXCLUDED.shares,
+        current_price = EXCLUDED.current_price,
+        allocation = EXCLUDED.allocation,
+        updated_at = NOW();
+
+    DELETE FROM positions
+    WHERE portfolio_id = save_portfolio_state.portfolio_id
+      AND ticker NOT IN (
+          SELECT elem->>'ticker' FROM jsonb_array_elements(save_portfolio_state.positions) AS elem
+      );
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- Portfolio with its positions aggregated into one row (one PostgREST read
+-- instead of a portfolios SELECT plus a positions SELECT)
+CREATE OR REPLACE VIEW v_portfolio_snapshot AS
+SELECT
+    p.id,
+    p.player_id,
+    p.risk_profile,
+    p.cash,
+    p.total_value,
+    COALESCE(
+        jsonb_agg(
+            jsonb_build_object(
+                'ticker', pos.ticker,
+                'shares', pos.shares,
+                'current_price', pos.current_price,
+                'allocation', pos.allocation,
+                'value', pos.shares * pos.current_price
+            ) ORDER BY pos.ticker
+        ) FILTER (WHERE pos.ticker IS NOT NULL),
+        '[]'::jsonb
+    ) AS positions
+FROM portfolios p
+LEFT JOIN positions pos ON pos.portfolio_id = p.id
+GROUP BY p.id;
+
 -- Comments for documentation
 COMMENT ON TABLE portfolios IS 'Player portfolios with stock allocations';
 COMMENT ON TABLE positions IS 'Individual stock positions within portfolios (shares, prices, allocations)';
@@ -197,3 +314,4 @@ COMMENT ON TABLE game_rounds IS 'Individual rounds with events, decisions, and o
 COMMENT ON TABLE decision_tracker IS 'Behavioral analysis data for each round';
 COMMENT ON TABLE historical_cases IS 'Pre-seeded historical price paths for outcome replay';
 COMMENT ON TABLE behavioral_profiles IS 'Final behavioral profile and coaching for each game';
+COMMENT ON VIEW v_portfolio_snapshot IS 'Portfolio row with positions as a JSONB array, for single-read snapshots';